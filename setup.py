@@ -22,7 +22,7 @@ setup(
     author_email = 'york.jong@gmail.com',
     description = 'Visualizing Stocks',
     long_description = open('README.md').read(),
-    python_requires = '>=3.6',
+    python_requires = '>=3.7',
     packages = find_packages(),
     install_requires = [
         'pandas',
@@ -33,5 +33,12 @@ setup(
         'beautifulsoup4',
         #'kaleido',  # plotly uses this to save picture
     ],
+    extras_require = {
+        'fast': [
+            'orjson',   # plotly serializes figures with it when installed
+            'plotly-resampler', # downsamples long histories
+            'bottleneck',   # speeds up ta.rolling_means
+        ],
+    },
 )
 
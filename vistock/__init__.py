@@ -4,7 +4,7 @@ Initialize vistock package.
 __software__ = "Visualizing Stocks"
 __version__ = "0.8.0"
 __author__ = "York <york.jong@gmail.com>"
-__date__ = "2023/02/02 (initial version) ~ 2024/10/01 (last revision)"
+__date__ = "2023/02/02 (initial version) ~ 2026/10/16 (last revision)"
 
 __all__ = [
     'mpl',              # plot with mplfinance (using matplotlib internal)
@@ -15,10 +15,14 @@ __all__ = [
     'stock_indices',    # functions for Stock Indices
 ]
 
-from . import mpl
-from . import plotly
-from . import tw
-from . import ibd
-#from . import rsm
-from . import stock_indices
+import importlib
+
+
+def __getattr__(name):
+    # Import the modules listed above on first access, so that using only one
+    # module (e.g., vistock.ranking_utils) does not load matplotlib, Plotly,
+    # and yfinance.
+    if name in __all__:
+        return importlib.import_module(f'.{name}', __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
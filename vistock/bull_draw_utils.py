@@ -2,7 +2,7 @@
 Utility Functons to calculate bull-run and drawdown.
 """
 __author__ = "York <york.jong@gmail.com>"
-__date__ = "2024/07/21 (initial version) ~ 2024/07/21 (last revision)"
+__date__ = "2024/07/21 (initial version) ~ 2026/10/16 (last revision)"
 
 import numpy as np
 
@@ -21,16 +21,16 @@ def calculate_bull_run(df):
     pandas.Series
         Series representing the bull-run values.
     """
-    df['Daily_Return'] = df['Close'].pct_change()
-    df['Cumulative_Return'] = (1 + df['Daily_Return']).cumprod()
-    df['Drawdown'] = df['Cumulative_Return'] / df['Cumulative_Return'].cummax() - 1
-    drawdown_threshold = np.percentile(df['Drawdown'].dropna(), 80)
+    daily_returns = df['Close'].pct_change()
+    cumulative_returns = (1 + daily_returns).cumprod()
+    drawdowns = cumulative_returns / cumulative_returns.cummax() - 1
+    drawdown_threshold = np.percentile(drawdowns.dropna(), 80)
 
     bull_run = 0
     max_price = df['Close'].iloc[0]
     bull_runs = []
 
-    for price, returns in zip(df['Close'], df['Daily_Return']):
+    for price, returns in zip(df['Close'], daily_returns):
         if price > max_price:
             max_price = price
 
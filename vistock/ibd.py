@@ -39,9 +39,9 @@ See Also:
   <https://www.investors.com/ibd-university/
   find-evaluate-stocks/exclusive-ratings/>`_
 """
-__version__ = "5.6"
+__version__ = "5.7"
 __author__ = "York <york.jong@gmail.com>"
-__date__ = "2024/08/05 (initial version) ~ 2024/10/27 (last revision)"
+__date__ = "2024/08/05 (initial version) ~ 2026/10/16 (last revision)"
 
 __all__ = [
     'relative_strength',
@@ -51,6 +51,7 @@ __all__ = [
 ]
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import pandas as pd
 import yfinance as yf
 
@@ -90,8 +91,9 @@ def relative_strength(closes, closes_ref, interval='1d'):
 
     Parameters
     ----------
-    closes: pd.Series
-        Closing prices of the stock.
+    closes: pd.Series or pd.DataFrame
+        Closing prices of the stock, or a DataFrame with a column of closing
+        prices per stock to calculate all of them at once.
 
     closes_ref: pd.Series
         Closing prices of the reference index.
@@ -102,8 +104,9 @@ def relative_strength(closes, closes_ref, interval='1d'):
 
     Returns
     -------
-    pd.Series
-        Relative strength values for the stock.
+    pd.Series or pd.DataFrame
+        Relative strength values for the stock(s), in the same shape as
+        `closes`.
 
     Example
     -------
@@ -114,7 +117,7 @@ def relative_strength(closes, closes_ref, interval='1d'):
     """
     growth_stock = weighted_growth(closes, interval)
     growth_ref = weighted_growth(closes_ref, interval)
-    rs = (1 + growth_stock) / (1 + growth_ref) * 100
+    rs = (1 + growth_stock).div(1 + growth_ref, axis=0) * 100
     return round(rs, 2)
 
 
@@ -139,8 +142,9 @@ def weighted_growth(closes, interval):
 
     Parameters
     ----------
-    closes: pd.Series
-        Closing prices of the stock/index.
+    closes: pd.Series or pd.DataFrame
+        Closing prices of the stock/index, or a DataFrame with a column of
+        closing prices per stock.
     interval: str, optional
         The frequency of the data points. Must be one of '1d' for daily
         data, '1wk' for weekly data, or '1mo' for monthly data.
@@ -172,8 +176,9 @@ def quarters_growth(closes, n, interval):
 
     Parameters
     ----------
-    closes: pd.Series
-        Closing prices of the stock or index.
+    closes: pd.Series or pd.DataFrame
+        Closing prices of the stock or index, or a DataFrame with a column of
+        closing prices per stock.
 
     n: int
         Number of quarters to look back.
@@ -219,8 +224,9 @@ def relative_strength_3m(closes, closes_ref, interval='1d'):
 
     Parameters
     ----------
-    closes: pd.Series
-        Closing prices of the stock.
+    closes: pd.Series or pd.DataFrame
+        Closing prices of the stock, or a DataFrame with a column of closing
+        prices per stock to calculate all of them at once.
 
     closes_ref: pd.Series
         Closing prices of the reference index.
@@ -231,10 +237,11 @@ def relative_strength_3m(closes, closes_ref, interval='1d'):
 
     Returns
     -------
-    pd.Series
-        3-Month relative strength values for the stock, rounded to two decimal
-        places. The values represent the stock's performance relative to the
-        benchmark index, with 100 indicating parity.
+    pd.Series or pd.DataFrame
+        3-Month relative strength values for the stock(s), in the same shape
+        as `closes`, rounded to two decimal places. The values represent the
+        stock's performance relative to the benchmark index, with 100
+        indicating parity.
     """
     # Determine the number of trading days for the specified interval
     span = {
@@ -253,8 +260,9 @@ def relative_strength_with_span(closes, closes_ref, span):
 
     Parameters
     ----------
-    closes: pd.Series
-        Closing prices of the stock.
+    closes: pd.Series or pd.DataFrame
+        Closing prices of the stock, or a DataFrame with a column of closing
+        prices per stock.
 
     closes_ref: pd.Series
         Closing prices of the reference index.
@@ -265,8 +273,9 @@ def relative_strength_with_span(closes, closes_ref, span):
 
     Returns
     -------
-    pd.Series
-        Relative strength values for the stock, rounded to two decimal places.
+    pd.Series or pd.DataFrame
+        Relative strength values for the stock(s), rounded to two decimal
+        places.
         The values represent the stock's performance relative to the benchmark
         index, with 100 indicating parity.
     """
@@ -283,17 +292,33 @@ def relative_strength_with_span(closes, closes_ref, span):
     ema_gf_ref = gf_ref.ewm(span=span, adjust=False).mean()
 
     # Calculate the cumulative growth factors
-    cum_gf_stock = ema_gf_stock.rolling(window=span,
-                                        min_periods=1).apply(np.prod, raw=True)
-    cum_gf_ref = ema_gf_ref.rolling(window=span,
-                                    min_periods=1).apply(np.prod, raw=True)
+    cum_gf_stock = _rolling_prod(ema_gf_stock, span)
+    cum_gf_ref = _rolling_prod(ema_gf_ref, span)
 
     # Calculate the relative strength (RS)
-    rs = cum_gf_stock / cum_gf_ref * 100
+    rs = cum_gf_stock.div(cum_gf_ref, axis=0) * 100
 
     return rs.round(2)  # Return the RS values rounded to two decimal places
 
 
+def _rolling_prod(values, window):
+    """
+    Same as ``values.rolling(window, min_periods=1).apply(np.prod, raw=True)``
+    for a Series or DataFrame, but with one NumPy reduction over sliding
+    windows instead of a Python call per window.
+    """
+    arr = values.to_numpy(dtype=np.float64)
+    if len(arr) == 0:
+        return values.astype(np.float64)
+    # Pad with ones, so the first windows multiply only the values so far
+    w = min(window, len(arr))
+    padded = np.concatenate([np.ones((w - 1,) + arr.shape[1:]), arr])
+    prods = sliding_window_view(padded, w, axis=0).prod(axis=-1)
+    if isinstance(values, pd.Series):
+        return pd.Series(prods, index=values.index, name=values.name)
+    return pd.DataFrame(prods, index=values.index, columns=values.columns)
+
+
 #------------------------------------------------------------------------------
 # IBD RS Rankings
 #------------------------------------------------------------------------------
@@ -420,57 +445,58 @@ def build_stock_rs_df(tickers, ticker_ref='^GSPC', period='2y', interval= '1d',
     except KeyError:
         raise ValueError("Invalid interval. " "Must be '1d', or '1wk'.")
 
-    # simple moving average function
-    sma = lambda x, win: x.rolling(window=win, min_periods=1).mean()
-
     # Batch download stock price data
     df_all = yf.download([ticker_ref] + tickers,
                          period=period, interval=interval, auto_adjust=True)
-    df_ref = df_all.xs(ticker_ref, level='Ticker', axis=1)
-
-    rs_data = []
-    price_ma = {}
-    for ticker in tickers:
-        df = df_all.xs(ticker, level='Ticker', axis=1)
-
-        # Caluclate Moving Average
-        for win in ma_wins:
-            price_ma[f'{win}'] = sma(df['Close'], win).round(2)
-        vol_div_vma = (df['Volume'] / sma(df['Volume'], vma_win)).round(2)
-
-        # Calculate Relative Strengths
-        rs = rs_func(df['Close'], df_ref['Close'], interval)
-        end_date = rs.index[-1]
-
-        # Calculate max values for the specified time periods
-        one_week_ago = end_date - pd.DateOffset(weeks=1)
-        one_month_ago = end_date - pd.DateOffset(months=1)
-        three_months_ago = end_date - pd.DateOffset(months=3)
-        six_months_ago = end_date - pd.DateOffset(months=6)
-        nine_months_ago = end_date - pd.DateOffset(months=9)
-
-        # Calculate position in 52W range
-        high_52w = df['Close'].rolling(window=252, min_periods=1).max().iloc[-1]
-        low_52w = df['Close'].rolling(window=252, min_periods=1).min().iloc[-1]
-        current_price = df['Close'].asof(end_date)
-        range_position = (current_price - low_52w) / (high_52w - low_52w)
-
-        rs_data.append({
-            'Ticker': ticker,
-            'RS': rs.asof(end_date),
-            '1wk:end max': rs.loc[one_week_ago:end_date].max(),
-            '1mo:1wk max': rs.loc[one_month_ago:one_week_ago].max(),
-            '3mo:1mo max': rs.loc[three_months_ago:one_month_ago].max(),
-            '6mo:3mo max': rs.loc[six_months_ago:three_months_ago].max(),
-            '9mo:6mo max': rs.loc[nine_months_ago:six_months_ago].max(),
-            'Price': df['Close'].asof(end_date).round(2),
-            '52W pos': range_position.round(2),
-            **{f'MA{w}': price_ma[f'{w}'].iloc[-1] for w in ma_wins},
-            f'Volume / VMA{vma_win}': vol_div_vma.iloc[-1],
-        })
-
-    # Create DataFrame from RS data
-    stock_df = pd.DataFrame(rs_data)
+    # Take the Close and Volume blocks once (columns are tickers), so that
+    # each stock is a column lookup instead of a MultiIndex slice of df_all
+    closes_all = df_all.xs('Close', level='Price', axis=1)
+    volumes_all = df_all.xs('Volume', level='Price', axis=1)
+    closes_ref = closes_all[ticker_ref]
+
+    # Dates of the time periods to take max values in, the same for all
+    # stocks as they share the date index
+    end_date = closes_all.index[-1]
+    one_week_ago = end_date - pd.DateOffset(weeks=1)
+    one_month_ago = end_date - pd.DateOffset(months=1)
+    three_months_ago = end_date - pd.DateOffset(months=3)
+    six_months_ago = end_date - pd.DateOffset(months=6)
+    nine_months_ago = end_date - pd.DateOffset(months=9)
+
+    # Relative strengths of all stocks at once, so the benchmark's growths
+    # are calculated once rather than once per stock
+    rss = rs_func(closes_all, closes_ref, interval)
+
+    # Latest price MAs and Volume / VMA of all stocks. The last value of a
+    # min_periods=1 SMA is the mean of the valid values in the last window.
+    price_mas = {w: closes_all.iloc[-w:].mean().round(2) for w in ma_wins}
+    vol_div_vmas = (volumes_all.iloc[-1]
+                    / volumes_all.iloc[-vma_win:].mean()).round(2)
+
+    # Calculate positions in 52W range
+    prices = closes_all.ffill().iloc[-1]
+    high_52w = closes_all.iloc[-252:].max()
+    low_52w = closes_all.iloc[-252:].min()
+    range_positions = (prices - low_52w) / (high_52w - low_52w)
+
+    # Calculate max values for the specified time periods, for all stocks
+    rss = rss[tickers]
+    rs_max = lambda start, end: rss.loc[start:end].max().to_numpy()
+
+    # Create DataFrame from the columns of RS data
+    stock_df = pd.DataFrame({
+        'Ticker': tickers,
+        'RS': rss.ffill().iloc[-1].to_numpy(),
+        '1wk:end max': rs_max(one_week_ago, end_date),
+        '1mo:1wk max': rs_max(one_month_ago, one_week_ago),
+        '3mo:1mo max': rs_max(three_months_ago, one_month_ago),
+        '6mo:3mo max': rs_max(six_months_ago, three_months_ago),
+        '9mo:6mo max': rs_max(nine_months_ago, six_months_ago),
+        'Price': prices[tickers].round(2).to_numpy(),
+        '52W pos': range_positions[tickers].round(2).to_numpy(),
+        **{f'MA{w}': price_mas[w][tickers].to_numpy() for w in ma_wins},
+        f'Volume / VMA{vma_win}': vol_div_vmas[tickers].to_numpy(),
+    })
 
     return stock_df
 
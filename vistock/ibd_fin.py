@@ -25,9 +25,9 @@ For example:
     # Example usage
     ranking_df = financial_metric_ranking(stock_data)
 """
-__version__ = "1.6"
+__version__ = "1.7"
 __author__ = "York <york.jong@gmail.com>"
-__date__ = "2024/09/15 (initial version) ~ 2024/10/13 (last revision)"
+__date__ = "2024/09/15 (initial version) ~ 2026/10/16 (last revision)"
 
 __all__ = [
     'metric_strength_vs_benchmark',
@@ -72,9 +72,18 @@ def metric_strength_vs_benchmark(quarterly_metric, annual_metric,
         difference in weighted YoY growth between the metric and the benchmark,
         multiplied by 100.
     """
+    yoy_growth_bench = weighted_yoy_growth(quarterly_bench, annual_bench)
+    return _strength_vs_bench_growth(quarterly_metric, annual_metric,
+                                     yoy_growth_bench)
+
+
+def _strength_vs_bench_growth(quarterly_metric, annual_metric,
+                              yoy_growth_bench):
+    """metric_strength_vs_benchmark with the weighted YoY growth of the
+    benchmark already calculated, so that it is shared by all stocks.
+    """
     # Calculate weighted YoY growth
     yoy_growth_metric = weighted_yoy_growth(quarterly_metric, annual_metric)
-    yoy_growth_bench = weighted_yoy_growth(quarterly_bench, annual_bench)
     #print('weighted yoy:', yoy_growth_metric, yoy_growth_bench)
 
     # Align series lengths
@@ -237,12 +246,16 @@ def financial_metric_ranking(tickers):
                                            'Operating Revenue', 'marketCap')
     bench_rev_a = yfu.calc_weighted_metric(fins_a, info,
                                            'Operating Revenue', 'marketCap')
+
+    # Weighted YoY growths of benchmark, the same for all stocks
+    growth_eps_bench = weighted_yoy_growth(bench_eps_q, bench_eps_a)
+    growth_rev_bench = weighted_yoy_growth(bench_rev_q, bench_rev_a)
+
     rows = []
     for ticker in tickers:
         eps_q = fins_q[ticker]['Basic EPS']
         eps_a = fins_a[ticker]['Basic EPS']
-        eps_rs = metric_strength_vs_benchmark(eps_q, eps_a,
-                                              bench_eps_q, bench_eps_a)
+        eps_rs = _strength_vs_bench_growth(eps_q, eps_a, growth_eps_bench)
         #print('eps: ', eps_q, eps_a)
         eps_qoq = qoq_growth(eps_q).round(2)
         eps_yoy = yoy_growth(eps_q, 'Q').round(2)
@@ -250,8 +263,7 @@ def financial_metric_ranking(tickers):
 
         rev_q = fins_q[ticker]['Operating Revenue']
         rev_a = fins_a[ticker]['Operating Revenue']
-        rev_rs = metric_strength_vs_benchmark(rev_q, rev_a,
-                                              bench_rev_q, bench_rev_a)
+        rev_rs = _strength_vs_bench_growth(rev_q, rev_a, growth_rev_bench)
         pe = info[ticker]['trailingPE']
         if not isinstance(pe, float):
             print(f"info[{ticker}]['trailingPE']: {pe}")
@@ -17,9 +17,9 @@ Usage:
     ibd_rs.plot('TSLA', period='1y', interval='1d')
 """
 __software__ = "IBD-compatible stock chart"
-__version__ = "1.9"
+__version__ = "1.10"
 __author__ = "York <york.jong@gmail.com>"
-__date__ = "2024/08/16 (initial version) ~ 2024/10/10 (last revision)"
+__date__ = "2024/08/16 (initial version) ~ 2026/10/16 (last revision)"
 
 __all__ = ['plot']
 
@@ -32,6 +32,7 @@ from .. import file_utils
 from ..utils import MarketColorStyle, decide_market_color_style
 from . import mpf_utils as mpfu
 from ..ibd import relative_strength, relative_strength_3m
+from ..ta import rolling_means
 from .. import stock_indices as si
 
 
@@ -144,18 +145,16 @@ def plot(symbol, period='2y', interval='1d', ticker_ref=None, rs_window='12mo',
     except KeyError:
         raise ValueError("Invalid interval. " "Must be '1d', or '1wk'.")
 
-    # Calculate price moving average
-    for n in ma_wins:
-        df[f'MA {n}'] = df['Close'].rolling(window=n, min_periods=1).mean()
+    # Calculate price moving averages
+    mas = rolling_means(df['Close'], ma_wins, min_periods=1)
 
     # Calculate volume moving averaage
-    df[f'VMA {vma_win}'] = df['Volume'].rolling(window=vma_win,
-                                                   min_periods=1).mean()
+    vmas = rolling_means(df['Volume'], [vma_win], min_periods=1)
 
     addplot = [
         # Plot of Price Moving Average
-        *[mpf.make_addplot(df[f'MA {n}'], panel=0, label=f'MA {n}')
-            for n in ma_wins],
+        *[mpf.make_addplot(sma, panel=0, label=f'MA {n}')
+            for n, sma in zip(ma_wins, mas)],
 
         # Plot of Relative Strength
         mpf.make_addplot(df['RS'], panel=1, label=ticker,
@@ -164,7 +163,7 @@ def plot(symbol, period='2y', interval='1d', ticker_ref=None, rs_window='12mo',
                          linestyle='--', color='gray'),
 
         # Plot of Volume Moving Average
-        mpf.make_addplot(df[f'VMA {vma_win}'], panel=2,
+        mpf.make_addplot(vmas[0], panel=2,
                          label=f'VMA {vma_win}', color='purple'),
     ]
 
@@ -2,9 +2,9 @@
 Visualize a Volume Profile (or Turnover Profile) for a stock.
 """
 __software__ = "Profile 2-split with mplfinace"
-__version__ = "3.3"
+__version__ = "3.5"
 __author__ = "York <york.jong@gmail.com>"
-__date__ = "2023/02/02 (initial version) ~ 2024/09/05 (last revision)"
+__date__ = "2023/02/02 (initial version) ~ 2026/10/16 (last revision)"
 
 __all__ = [
     'Volume',   # Volume Profile, i.e., PBV (Price-by-Volume) or Volume-by-Price
@@ -18,28 +18,28 @@ import mplfinance as mpf
 from .. import tw
 from .. import file_utils
 from ..utils import MarketColorStyle, decide_market_color_style
+from ..ta import rolling_means, volume_profile
 from . import mpf_utils as mpfu
 
 
 def _plot(df, mpf_style, profile_field='Volume', period='1y', interval='1d',
           ma_nitems=(5, 10, 20, 50, 150), vma_nitems=50,
           total_bins=42, legend_loc='best', hides_nontrading=True):
-    # Calculate price moving average
-    for n in ma_nitems:
-        df[f'MA {n}'] = df['Close'].rolling(window=n).mean()
+    # Calculate price moving averages
+    mas = rolling_means(df['Close'], ma_nitems)
     colors = ('orange', 'red', 'green', 'blue', 'cyan', 'magenta', 'yellow')
 
     # Calculate volume moving averaage
-    df[f'VMA {vma_nitems}'] = df['Volume'].rolling(window=vma_nitems).mean()
+    vmas = rolling_means(df['Volume'], [vma_nitems])
 
     # Create subplots
     addplot = [
         # Plot of Price Moving Average
-        *[mpf.make_addplot(df[f'MA {n}'], panel=0, label=f'MA {n}', color=c)
-            for n, c in zip(ma_nitems, colors)],
+        *[mpf.make_addplot(sma, panel=0, label=f'MA {n}', color=c)
+            for n, c, sma in zip(ma_nitems, colors, mas)],
 
         # Plot of Volume Moving Average
-        mpf.make_addplot(df[f'VMA {vma_nitems}'], panel=1,
+        mpf.make_addplot(vmas[0], panel=1,
                          label=f'VMA {vma_nitems}', color='purple'),
     ]
 
@@ -64,14 +64,13 @@ def _plot(df, mpf_style, profile_field='Volume', period='1y', interval='1d',
         df.index = df.index.strftime('%Y-%m-%d')
 
     # Add Profile (e.g., Volume Profile or Turnover Profile)
-    bin_size = (max(df['High']) - min(df['Low'])) / total_bins
-    bin_round = lambda x: bin_size * round(x / bin_size)
-    bin = df[profile_field].groupby(
-            df['Close'].apply(lambda x: bin_round(x))).sum()
+    bin_size = (df['High'].max() - df['Low'].min()) / total_bins
+    prices, sums = volume_profile(df['Close'].to_numpy(),
+                                  df[profile_field].to_numpy(), bin_size)
     ax = fig.add_axes(axes[0].get_position(), sharey=axes[0], frameon=False)
     ax.barh(
-        y=bin.keys(),       # price
-        width=bin.values,   # bin comulative volume/turnover
+        y=prices,           # price
+        width=sums,         # bin comulative volume/turnover
         height=0.75*bin_size,
         align='center',
         color='cyan',
@@ -79,7 +78,7 @@ def _plot(df, mpf_style, profile_field='Volume', period='1y', interval='1d',
     )
 
     # Set x ticks of the Profile
-    ax.set_xlim(right=1.2*max(bin.values))
+    ax.set_xlim(right=1.2*sums.max())
     ax.tick_params(top=True, labeltop=True, bottom=False, labelbottom=False)
 
     # Set x label of the Profile
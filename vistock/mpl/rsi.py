@@ -6,9 +6,9 @@ Plot a 3-split (price, volume, RSI) stock chart.
 * RSI from TA-Lib
 """
 __software__ = "Stock chart of price, volume, and RSI"
-__version__ = "1.12"
+__version__ = "1.13"
 __author__ = "York <york.jong@gmail.com>"
-__date__ = "2023/02/02 (initial version) ~ 2024/09/05 (last revision)"
+__date__ = "2023/02/02 (initial version) ~ 2026/10/16 (last revision)"
 
 __all__ = ['plot']
 
@@ -118,22 +118,21 @@ def plot(symbol='TSLA', period='1y', interval='1d',
     ticker = tw.as_yfinance(symbol)
     df = yf.Ticker(ticker).history(period=period, interval=interval)
 
-    # Calculate price moving average
-    for n in ma_nitems:
-        df[f'MA {n}'] = df['Close'].rolling(window=n).mean()
+    # Calculate price moving averages
+    mas = ta.rolling_means(df['Close'], ma_nitems)
     colors = ('orange', 'red', 'green', 'blue', 'cyan', 'magenta', 'yellow')
 
     # Calculate volume moving averaage
-    df[f'VMA {vma_nitems}'] = df['Volume'].rolling(window=vma_nitems).mean()
+    vmas = ta.rolling_means(df['Volume'], [vma_nitems])
 
     # Create subplots
     addplot = [
         # Plot of Price Moving Average
-        *[mpf.make_addplot(df[f'MA {n}'], panel=0, label=f'MA {n}', color=c)
-            for n, c in zip(ma_nitems, colors)],
+        *[mpf.make_addplot(sma, panel=0, label=f'MA {n}', color=c)
+            for n, c, sma in zip(ma_nitems, colors, mas)],
 
         # Plot of Volume Moving Average
-        mpf.make_addplot(df[f'VMA {vma_nitems}'], panel=1,
+        mpf.make_addplot(vmas[0], panel=1,
                          label=f'VMA {vma_nitems}', color='purple'),
 
         # Plot of RSI
@@ -2,9 +2,9 @@
 Visualize a BullRun and Drawdown for a stock.
 """
 __software__ = "BullRun & Drawdown"
-__version__ = "1.3"
+__version__ = "1.4"
 __author__ = "York <york.jong@gmail.com>"
-__date__ = "2024/07/21 (initial version) ~ 2024/08/20 (last revision)"
+__date__ = "2024/07/21 (initial version) ~ 2026/10/16 (last revision)"
 
 __all__ = [ 'plot' ]
 
@@ -15,6 +15,7 @@ from plotly.subplots import make_subplots
 
 from .. import tw
 from .. import file_utils
+from ..ta import rolling_means
 from . import fig_utils as futil
 from ..bull_draw_utils import calculate_bull_run, calculate_drawdown
 from ..utils import MarketColorStyle, decide_market_color_style
@@ -119,15 +120,15 @@ def plot(symbol='TSLA', period='1y', interval='1d',
 
     # Add bull-run trace to the figure
     cl = get_bullrun_color(mc_style)
-    df['BullRun'] = calculate_bull_run(df)
-    drawdown = go.Bar(x=df.index, y=df['BullRun'], name='BullRun',
+    bull_runs = calculate_bull_run(df)
+    drawdown = go.Bar(x=df.index, y=bull_runs, name='BullRun',
                     marker_color=cl, opacity=0.5)
     fig.add_trace(drawdown)
 
     # Add drawdown trace to the figure
     cl = get_drawdown_color(mc_style)
-    df['Drawdown'] = calculate_drawdown(df)
-    drawdown = go.Bar(x=df.index, y=df['Drawdown'], name='Drawdown',
+    drawdowns = calculate_drawdown(df).to_numpy()
+    drawdown = go.Bar(x=df.index, y=drawdowns, name='Drawdown',
                     marker_color=cl, opacity=0.5)
     fig.add_trace(drawdown)
 
@@ -135,29 +136,29 @@ def plot(symbol='TSLA', period='1y', interval='1d',
     cl = futil.get_volume_colors(mc_style)
 
     # Add close-low diff trace to the figure
-    df['Close-Low'] = (df['Close'] - df['Low']) / df['Close']
-    diff = go.Bar(x=df.index, y=df['Close-Low'], name='Close-Low',
+    closes = df['Close'].to_numpy()
+    close_low = (closes - df['Low'].to_numpy()) / closes
+    diff = go.Bar(x=df.index, y=close_low, name='Close-Low',
                   marker_color=cl['up'], opacity=0.5)
     fig.add_trace(diff)
 
     # Add close-high diff trace to the figure
-    df['Close-High'] = (df['Close'] - df['High']) / df['Close']
-    diff = go.Bar(x=df.index, y=df['Close-High'], name='Close-High',
+    close_high = (closes - df['High'].to_numpy()) / closes
+    diff = go.Bar(x=df.index, y=close_high, name='Close-High',
                     marker_color=cl['down'], opacity=0.5)
     fig.add_trace(diff)
 
     fig.update_layout(barmode='overlay')
 
     # Add volume trace to 2nd row
-    colors = [cl['up'] if c >= o
-              else cl['down'] for o, c in zip(df['Open'], df['Close'])]
+    marker = futil.get_volume_bar_marker(df['Open'], df['Close'], mc_style)
     volume = go.Bar(x=df.index, y=df['Volume'], name='Volume',
-                    marker_color=colors, opacity=0.5)
+                    marker=marker, opacity=0.5)
     fig.add_trace(volume, row=2, col=1)
 
     # Add moving average volume to 2nd row
-    df['vma50'] = df['Volume'].rolling(window=50).mean()
-    vma50 = go.Scatter(x=df.index, y=df['vma50'], name='VMA 50',
+    vmas = rolling_means(df['Volume'], [50])
+    vma50 = go.Scatter(x=df.index, y=vmas[0], name='VMA 50',
                        line=dict(color='purple', width=2))
     fig.add_trace(vma50, row=2, col=1)
 
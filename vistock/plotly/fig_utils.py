@@ -2,50 +2,271 @@
 Common utility for Plotly figures.
 """
 __author__ = "York <york.jong@gmail.com>"
-__date__ = "2023/02/09 (initial version) ~ 2024/10/03 (last revision)"
+__date__ = "2023/02/09 (initial version) ~ 2026/10/16 (last revision)"
 
 __all__ = [
+    'MA_COLORS',
     'get_candlestick_colors',
     'get_volume_colors',
+    'get_volume_bar_colors',
+    'get_volume_bar_marker',
+    'get_price_bins',
+    'get_scatter_type',
+    'get_plot_dates',
+    'get_ohlc_arrays',
+    'format_date_range',
+    'resample_figure',
     'hide_nontrading_periods',
     'add_crosshair_cursor',
     'add_hovermode_menu',
+    'write_html',
 ]
 
+import numpy as np
 import pandas as pd
+import plotly.graph_objs as go
 from ..utils import MarketColorStyle
+from ..ta import volume_profile
 
 
-def get_candlestick_colors(market_color_style=MarketColorStyle.WESTERN):
-    colors = {
-        'increasing_line_color': '#32a455',
-        'increasing_fillcolor': 'rgba(50, 164, 85, 0.4)',
-        'decreasing_line_color': '#d71917',
-        'decreasing_fillcolor': 'rgba(215, 25, 23, 0.4)'
-    }
+# Colors of moving-average lines, in the order of their windows
+MA_COLORS = ('orange', 'red', 'green', 'blue', 'cyan', 'magenta', 'yellow')
+
+_WESTERN_CANDLESTICK_COLORS = {
+    'increasing_line_color': '#32a455',
+    'increasing_fillcolor': 'rgba(50, 164, 85, 0.4)',
+    'decreasing_line_color': '#d71917',
+    'decreasing_fillcolor': 'rgba(215, 25, 23, 0.4)'
+}
+_EASTERN_CANDLESTICK_COLORS = {
+    'increasing_line_color': '#d71917',
+    'increasing_fillcolor': 'rgba(215, 25, 23, 0.4)',
+    'decreasing_line_color': '#32a455',
+    'decreasing_fillcolor': 'rgba(50, 164, 85, 0.4)',
+}
+_WESTERN_VOLUME_COLORS = {'up': 'green', 'down': 'red'}
+_EASTERN_VOLUME_COLORS = {'up': 'red', 'down': 'green'}
+
 
+def get_candlestick_colors(market_color_style=MarketColorStyle.WESTERN):
     if market_color_style == MarketColorStyle.WESTERN:
-        return colors
+        return dict(_WESTERN_CANDLESTICK_COLORS)
     else:
-        return {
-            'increasing_line_color': colors['decreasing_line_color'],
-            'increasing_fillcolor': colors['decreasing_fillcolor'],
-            'decreasing_line_color': colors['increasing_line_color'],
-            'decreasing_fillcolor': colors['increasing_fillcolor'],
-        }
+        return dict(_EASTERN_CANDLESTICK_COLORS)
 
 
 def get_volume_colors(market_color_style=MarketColorStyle.WESTERN):
     if market_color_style == MarketColorStyle.WESTERN:
-        return {
-            'up': 'green',
-            'down': 'red'
-        }
+        return dict(_WESTERN_VOLUME_COLORS)
+    else:
+        return dict(_EASTERN_VOLUME_COLORS)
+
+
+def get_volume_bar_colors(opens, closes,
+                          market_color_style=MarketColorStyle.WESTERN):
+    """Get the color of each volume bar.
+
+    A bar takes the 'up' color if its close is not lower than its open;
+    otherwise it takes the 'down' color.
+
+    Parameters
+    ----------
+    opens: array-like
+        the open prices.
+    closes: array-like
+        the close prices.
+    market_color_style: MarketColorStyle
+        the market color style.
+
+    Returns
+    -------
+    numpy.ndarray of str
+        the color of each volume bar.
+    """
+    cl = get_volume_colors(market_color_style)
+    up = np.asarray(closes) >= np.asarray(opens)
+    return np.where(up, cl['up'], cl['down'])
+
+
+def get_volume_bar_marker(opens, closes,
+                          market_color_style=MarketColorStyle.WESTERN):
+    """Get the marker of volume bars colored by the direction of each bar.
+
+    Same coloring as get_volume_bar_colors, but each bar is given as 0 (down)
+    or 1 (up) and mapped through a two-color colorscale. Plotly validates a
+    numeric array in one pass instead of parsing every color string, and the
+    figure serializes the colors as a compact int8 array.
+
+    Parameters
+    ----------
+    opens: array-like
+        the open prices.
+    closes: array-like
+        the close prices.
+    market_color_style: MarketColorStyle
+        the market color style.
+
+    Returns
+    -------
+    dict
+        the marker properties of a go.Bar, e.g., go.Bar(marker=marker).
+    """
+    cl = get_volume_colors(market_color_style)
+    up = np.asarray(closes) >= np.asarray(opens)
+    return dict(color=up.astype(np.int8),
+                colorscale=[[0, cl['down']], [1, cl['up']]],
+                cmin=0, cmax=1)
+
+
+def get_price_bins(highs, lows, closes, values, total_bins):
+    """Get the bins of a price profile (e.g., Volume Profile or Turnover
+    Profile).
+
+    The price range from the lowest low to the highest high is divided into
+    total_bins bins, and the values are accumulated by close price.
+
+    Parameters
+    ----------
+    highs: array-like
+        the high prices.
+    lows: array-like
+        the low prices.
+    closes: array-like
+        the close prices.
+    values: array-like
+        the values to accumulate, e.g., volumes or turnovers.
+    total_bins: int
+        the number of bins.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        (bin prices, bin cumulative values).
+    """
+    bin_size = (np.nanmax(highs) - np.nanmin(lows)) / total_bins
+    return volume_profile(closes, values, bin_size)
+
+
+def get_scatter_type(npoints, hides_nontrading=True, max_svg_points=5000):
+    """Get the scatter trace type suited to the number of points of a line.
+
+    Long lines (e.g., intraday MAs) are drawn with WebGL (go.Scattergl),
+    which keeps pan and zoom responsive where SVG (go.Scatter) slows down.
+    WebGL traces ignore axis rangebreaks, so SVG is kept whenever non-trading
+    periods are hidden.
+
+    Parameters
+    ----------
+    npoints: int
+        the number of points of the line.
+    hides_nontrading: bool
+        whether non-trading periods are hidden by rangebreaks.
+    max_svg_points: int
+        the maximum number of points to draw with SVG.
+
+    Returns
+    -------
+    type
+        go.Scattergl for a long line without rangebreaks; go.Scatter
+        otherwise.
+    """
+    if npoints > max_svg_points and not hides_nontrading:
+        return go.Scattergl
+    return go.Scatter
+
+
+def format_date_range(index, interval):
+    """Format the first and last dates of a datetime index for display.
+
+    Parameters
+    ----------
+    index: pandas.DatetimeIndex
+        the datetime index of the stock data.
+    interval: str
+        the interval of an OHLC item; times are included for intraday
+        intervals (e.g., '5m', '1h').
+
+    Returns
+    -------
+    tuple of str
+        (first date, last date).
+    """
+    if interval.endswith('m') or interval.endswith('h'):
+        fmt = '%Y-%m-%d %H:%M'
     else:
-        return {
-            'up': 'red',
-            'down': 'green'
-        }
+        fmt = '%Y-%m-%d'
+    return index[0].strftime(fmt), index[-1].strftime(fmt)
+
+
+def resample_figure(fig, max_shown_samples=2000):
+    """Downsample the long line traces of a figure with plotly-resampler.
+
+    Only the points a browser can draw are sent; the full data is kept in the
+    returned figure for re-aggregation (e.g., with ``fig.show_dash()``).
+    plotly-resampler is optional; without it, the figure is returned as is.
+
+    Parameters
+    ----------
+    fig: plotly.graph_objs.Figure
+        the figure to downsample.
+    max_shown_samples: int
+        the maximum number of points shown per trace.
+
+    Returns
+    -------
+    plotly.graph_objs.Figure
+        a plotly_resampler.FigureResampler if plotly-resampler is installed;
+        fig otherwise.
+    """
+    try:
+        from plotly_resampler import FigureResampler
+    except ImportError:
+        return fig
+    return FigureResampler(fig, default_n_shown_samples=max_shown_samples)
+
+
+def get_plot_dates(index):
+    """Get the dates of a datetime index in the form Plotly handles fastest.
+
+    plotly.js shows dates in their wall-clock time and ignores timezone
+    offsets anyway. A tz-aware index, however, reaches Plotly as an object
+    array of Timestamps, which is validated and deep-copied element by
+    element for every trace; its wall-clock datetime64 values plot the same.
+
+    Parameters
+    ----------
+    index: pandas.DatetimeIndex
+        the datetime index of the stock data.
+
+    Returns
+    -------
+    numpy.ndarray
+        the wall-clock dates as datetime64 values.
+    """
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.to_numpy()
+
+
+def get_ohlc_arrays(df):
+    """Get the OHLC prices of stock data as float32 NumPy arrays.
+
+    Prices in float32 are precise enough for display and halve the data a
+    figure carries, so every trace of a figure should share these arrays.
+
+    Parameters
+    ----------
+    df: pandas.DataFrame
+        the stock data with 'Open', 'High', 'Low', and 'Close' columns.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        the opens, highs, lows, and closes.
+    """
+    return tuple(df[col].to_numpy(dtype=np.float32)
+                 for col in ('Open', 'High', 'Low', 'Close'))
 
 #------------------------------------------------------------------------------
 
@@ -71,25 +292,19 @@ def hide_nontrading_periods(fig, df, interval):
         - 60m, 1h - max 730 days (yes 1h is technically < 90m but this what
           Yahoo does)
     """
-    # If the index is not datetime, convert it back
-    if not isinstance(df.index, pd.DatetimeIndex):
-        df.index = pd.to_datetime(df.index)
+    # If the index is not datetime, convert it back (leave df untouched)
+    index = df.index
+    if not isinstance(index, pd.DatetimeIndex):
+        index = pd.to_datetime(index)
 
     # Convert aliases from `interval` to `freq`
     # These aliases represent 'month', 'minute', 'hour', 'day', and 'week'.
     freq = interval
     interval_aliases = ('mo', 'm', 'h', 'd', 'wk')
-    freq_aliases = ('M', 'min', 'H', 'D', 'W')
+    freq_aliases = ('MS', 'min', 'h', 'D', 'W')
     for i, f in zip(interval_aliases, freq_aliases):
         freq = freq.replace(i, f)
 
-    # Calculate nontrading time-periods
-    dt_all = pd.date_range(start=df.index[0], end=df.index[-1], freq=freq)
-    dt_breaks = dt_all.difference(df.index)
-    #print("All dates (dt_all):", dt_all)
-    #print("Trading dates (df.index):", df.index)
-    #print("Breaks (dt_breaks):", dt_breaks)
-
     # Calculate dvalue in milliseconds
     dvalue = 24*60*60 * 1000    # 1 day in milliseconds
     if interval.endswith('m'):      # minute
@@ -97,8 +312,44 @@ def hide_nontrading_periods(fig, df, interval):
     elif interval.endswith('h'):    # hour
         dvalue = 60*60 * int(interval.replace('h', '')) * 1000
 
+    # Hide weekends and off-session hours with rangebreak patterns, which
+    # plotly.js applies by itself, as long as no bar falls in them (e.g.,
+    # cryptocurrencies trade around the clock)
+    rangebreaks = []
+    has_weekend = (index.dayofweek >= 5).any()
+    if not has_weekend:
+        rangebreaks.append(dict(bounds=['sat', 'mon']))
+    session = None
+    if interval.endswith('m') or interval.endswith('h'):
+        hours = index.hour + index.minute / 60
+        start, end = hours.min(), hours.max() + dvalue / (60*60 * 1000)
+        if 0 < start and end < 24:
+            rangebreaks.append(dict(bounds=[end, start], pattern='hour'))
+            session = (start, end)
+
+    # Calculate the remaining nontrading time-periods (e.g., holidays)
+    dt_all = pd.date_range(start=index[0], end=index[-1], freq=freq)
+    if index.is_monotonic_increasing:
+        # both are sorted, so a binary search finds the missing times without
+        # building the hash table of a set difference
+        times, all_times = index.values, dt_all.values
+        pos = np.searchsorted(times, all_times)
+        pos[pos == len(times)] = len(times) - 1
+        dt_breaks = dt_all[times[pos] != all_times]
+    else:
+        dt_breaks = dt_all.difference(index)
+    if not has_weekend:
+        dt_breaks = dt_breaks[dt_breaks.dayofweek < 5]
+    if session:
+        hours = dt_breaks.hour + dt_breaks.minute / 60
+        dt_breaks = dt_breaks[(hours >= session[0]) & (hours < session[1])]
+    #print("All dates (dt_all):", dt_all)
+    #print("Trading dates (index):", index)
+    #print("Breaks (dt_breaks):", dt_breaks)
+    rangebreaks.append(dict(values=dt_breaks, dvalue=dvalue))
+
     # Update xaxes to hide non-trading time-periods
-    fig.update_xaxes(rangebreaks=[dict(values=dt_breaks, dvalue=dvalue)])
+    fig.update_xaxes(rangebreaks=rangebreaks)
 
 #------------------------------------------------------------------------------
 
@@ -153,3 +404,24 @@ def add_hovermode_menu(fig, x=0, y=1.05):
 
 #------------------------------------------------------------------------------
 
+def write_html(fig, out_dir, fn):
+    """Write a figure to an HTML file.
+
+    plotly.js is loaded from its CDN instead of being inlined as a ~4 MB
+    bundle, and the figure is not re-validated, since the plot functions
+    build valid figures by construction.
+
+    Parameters
+    ----------
+    fig: plotly.graph_objs.Figure
+        the figure to write.
+    out_dir: str
+        the directory of the HTML file.
+    fn: str
+        the file name of the HTML file, without the '.html' extension.
+    """
+    fig.write_html(f'{out_dir}/{fn}.html', include_plotlyjs='cdn',
+                   validate=False)
+
+#------------------------------------------------------------------------------
+
@@ -17,9 +17,9 @@ Usage:
     ibd_rs.plot('TSLA', period='1y', interval='1d')
 """
 __software__ = "IBD-compatible stock chart"
-__version__ = "2.2"
+__version__ = "2.3"
 __author__ = "York <york.jong@gmail.com>"
-__date__ = "2024/08/16 (initial version) ~ 2024/10/10 (last revision)"
+__date__ = "2024/08/16 (initial version) ~ 2026/10/16 (last revision)"
 
 __all__ = ['plot']
 
@@ -33,6 +33,7 @@ from .. import file_utils
 from . import fig_utils as futil
 from ..utils import MarketColorStyle, decide_market_color_style
 from ..ibd import relative_strength, relative_strength_3m
+from ..ta import rolling_means
 from .. import stock_indices as si
 
 
@@ -132,13 +133,11 @@ def plot(symbol, period='2y', interval='1d', ticker_ref=None, rs_window='12mo',
     except KeyError:
         raise ValueError("Invalid interval. " "Must be '1d', or '1wk'.")
 
-    # Calculate price moving average
-    for n in ma_wins:
-        df[f'MA {n}'] = df['Close'].rolling(window=n, min_periods=1).mean()
+    # Calculate price moving averages
+    mas = rolling_means(df['Close'], ma_wins, min_periods=1)
 
     # Calculate volume moving averaage
-    df[f'VMA {vma_win}'] = df['Volume'].rolling(window=vma_win,
-                                                   min_periods=1).mean()
+    vmas = rolling_means(df['Volume'], [vma_win], min_periods=1)
 
     # Create subplots
     fig = make_subplots(rows=3, cols=1, shared_xaxes=True,
@@ -150,19 +149,18 @@ def plot(symbol, period='2y', interval='1d', ticker_ref=None, rs_window='12mo',
     mc_style = decide_market_color_style(ticker, market_color_style)
     mc_colors = futil.get_candlestick_colors(mc_style)
 
-    cl = futil.get_volume_colors(mc_style)
-    vol_colors = [cl['up'] if c >= o
-                  else cl['down'] for o, c in zip(df['Open'], df['Close'])]
+    opens, highs, lows, closes = futil.get_ohlc_arrays(df)
+    vol_marker = futil.get_volume_bar_marker(opens, closes, mc_style)
 
     main_row, rs_row, vol_row = 1, 2, 3
     traces = [
         # Main subplot
-        (go.Candlestick(x=df.index, open=df['Open'], high=df['High'],
-                        low=df['Low'], close=df['Close'], name='Candle',
+        (go.Candlestick(x=df.index, open=opens, high=highs,
+                        low=lows, close=closes, name='Candle',
                         **mc_colors), main_row),
-        *[(go.Scatter(x=df.index, y=df[f'MA {n}'],
+        *[(go.Scatter(x=df.index, y=sma,
                       mode='lines', name=f'MA {n}'), main_row)
-          for n in ma_wins],
+          for n, sma in zip(ma_wins, mas)],
 
         # RS subplot
         (go.Scatter(x=df.index, y=df['RS'], mode='lines', name='RS',
@@ -172,9 +170,9 @@ def plot(symbol, period='2y', interval='1d', ticker_ref=None, rs_window='12mo',
                     line=dict(dash='dash', color='gray')), rs_row),
 
         # Volume subplot
-        (go.Bar(x=df.index, y=df['Volume'], name='Volume',
-               marker_color=vol_colors, opacity=0.5), vol_row),
-        (go.Scatter(x=df.index, y=df[f'VMA {vma_win}'],
+        (go.Bar(x=df.index, y=df['Volume'].to_numpy(), name='Volume',
+               marker=vol_marker, opacity=0.5), vol_row),
+        (go.Scatter(x=df.index, y=vmas[0],
                    mode='lines', name=f'VMA {vma_win}',
                    line=dict(color='purple', width=2)), vol_row),
     ]
@@ -35,9 +35,9 @@ See Also:
   mansfield-relative-strength/>`_
 """
 __software__ = "Mansfield Stock Charts"
-__version__ = "2.4"
+__version__ = "2.5"
 __author__ = "York <york.jong@gmail.com>"
-__date__ = "2024/08/24 (initial version) ~ 2024/09/12 (last revision)"
+__date__ = "2024/08/24 (initial version) ~ 2026/10/16 (last revision)"
 
 __all__ = [
     'StockChart',
@@ -187,18 +187,18 @@ class StockChart:
         mc_style = decide_market_color_style(ticker, market_color_style)
         mc_colors = futil.get_candlestick_colors(mc_style)
 
+        opens, highs, lows, closes = futil.get_ohlc_arrays(df)
+
         # colors of volume bars
-        cl = futil.get_volume_colors(mc_style)
-        vol_colors = [cl['up'] if c >= o
-                      else cl['down'] for o, c in zip(df['Open'], df['Close'])]
+        vol_marker = futil.get_volume_bar_marker(opens, closes, mc_style)
 
         # Plot the figure
         price_row, rsm_row, vol_row = 1, 2, 3
         traces = [
             # Stock Price and Moving Averages
             (go.Candlestick(
-                x=df.index, open=df['Open'], high=df['High'],
-                low=df['Low'], close=df['Close'], name='Candle', **mc_colors),
+                x=df.index, open=opens, high=highs,
+                low=lows, close=closes, name='Candle', **mc_colors),
              price_row),
             *[(go.Scatter(x=df.index, y=df[f'{ma}{window}'],
                           name=f'{ma}{window}'), price_row)
@@ -212,8 +212,8 @@ class StockChart:
                         line=dict(dash='dash', color='gray')), rsm_row),
 
             # Volume and Volume MA
-            (go.Bar(x=df.index, y=df['Volume'], name='Volume',
-                    marker_color=vol_colors, opacity=0.5), vol_row),
+            (go.Bar(x=df.index, y=df['Volume'].to_numpy(), name='Volume',
+                    marker=vol_marker, opacity=0.5), vol_row),
             (go.Scatter(x=df.index, y=df[f'Vol {ma}{vma_window}'],
                         name=f'Vol {ma}{vma_window}',
                         line=dict(color='purple', width=2)), vol_row),
@@ -3,28 +3,46 @@ Visualize a profile chart (eigher Volume Profile or Turnover Profile) with
 2-section layout for a given stock.
 """
 __software__ = "Profile with Plotly 2 subplots"
-__version__ = "2.1"
+__version__ = "2.3"
 __author__ = "York <york.jong@gmail.com>"
-__date__ = "2023/02/02 (initial version) ~ 2024/08/20 (last revision)"
+__date__ = "2023/02/02 (initial version) ~ 2026/10/16 (last revision)"
 
 __all__ = [
     'Volume',   # Volume Profile, i.e., PBV (Price-by-Volume) or Volume-by-Price
     'Turnover', # Turnover Profile
 ]
 
-import yfinance as yf
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
 import plotly.graph_objs as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 
 from .. import tw
 from .. import file_utils
+from ..yf_utils import download_history
+from ..ta import rolling_means
 from . import fig_utils as futil
 from ..utils import MarketColorStyle, decide_market_color_style
 
 
+def _plot_many(plot, symbols, max_workers, kwargs):
+    """Call plot(symbol, **kwargs) for each symbol in a thread pool, so that
+    the downloads and HTML writes of different symbols overlap.
+
+    The figures are only written to HTML files unless shows_figure=True is
+    passed, since showing them would open a browser tab per symbol.
+    """
+    kwargs.setdefault('shows_figure', False)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Consume the results to re-raise any exception of a plot call
+        list(executor.map(lambda symbol: plot(symbol, **kwargs), symbols))
+
+
 def _plot(df, ticker, market_color_style, profile_field='Volume',
-          period='1y', interval='1d',
+          interval='1d',
           ma_nitems=(5, 10, 20, 50, 150), vma_nitems=50, total_bins=42,
           hbar_align_on_right=True,
           template='plotly', hides_nontrading=True):
@@ -41,38 +59,46 @@ def _plot(df, ticker, market_color_style, profile_field='Volume',
         figure=go.Figure(layout=go.Layout(height=720))
     )
 
+    opens, highs, lows, closes = futil.get_ohlc_arrays(df)
+    volumes = df['Volume'].to_numpy()
+    dates = futil.get_plot_dates(df.index)     # wall-clock datetime64
+
     # Plot the candlestick chart
     mc_style = decide_market_color_style(ticker, market_color_style)
     mc_colors = futil.get_candlestick_colors(mc_style)
     candlestick = go.Candlestick(
-        x=df.index,
-        open=df['Open'], high=df['High'], low=df['Low'], close=df['Close'],
+        x=dates,
+        open=opens, high=highs, low=lows, close=closes,
         name='Candle',
         xaxis='x2', yaxis='y2',
         **mc_colors
     )
-    fig.add_trace(candlestick)
+    price_traces = [candlestick]
 
     # Add moving averages to the figure
-    colors = ('orange', 'red', 'green', 'blue', 'cyan', 'magenta', 'yellow')
-    for d, c in zip(ma_nitems, colors):
-        df[f'ma{d}'] = df['Close'].rolling(window=d).mean()
-        ma = go.Scatter(
-            x=df.index, y=df[f'ma{d}'], name=f'MA {d}',
-            line=dict(color=f'{c}', width=2),
+    scatter_type = futil.get_scatter_type(len(df), hides_nontrading)
+    mas = rolling_means(closes, ma_nitems, dtype=np.float32)
+    for d, c, sma in zip(ma_nitems, futil.MA_COLORS, mas):
+        if d > len(df):
+            continue    # no MA value at all; skip the empty trace
+        ma = scatter_type(
+            x=dates, y=sma, name=f'MA {d}', mode='lines',
+            line=dict(color=c, width=2),
             xaxis='x2', yaxis='y2',
         )
-        fig.add_trace(ma)
+        price_traces.append(ma)
 
     # Add Profile (e.g., Volume Profile or Turnover Profile)
-    bin_size = (max(df['High']) - min(df['Low'])) / total_bins
-    bin_round = lambda x: bin_size * round(x / bin_size)
-    bin = df[profile_field].groupby(
-            df['Close'].apply(lambda x: bin_round(x))).sum()
+    if profile_field == 'Turnover':
+        # turnover (trading value) = price * volume
+        values = np.multiply(df['Close'].to_numpy(), volumes)
+    else:
+        values = df[profile_field].to_numpy()
+    prices, sums = futil.get_price_bins(highs, lows, closes, values,
+                                        total_bins)
     vp = go.Bar(
-        y=bin.keys(),   # Price
-        x=bin.values,   # Bin Comulative Volume
-        text=bin,       # (price, volume) pairs
+        y=prices,       # Price
+        x=sums,         # Bin Comulative Volume
         name="Price Bins",
         orientation="h",    # 'v', 'h'
         marker_color="brown",
@@ -81,74 +107,77 @@ def _plot(df, ticker, market_color_style, profile_field='Volume',
         opacity=0.3,
         xaxis='x', yaxis='y',
     )
-    fig.add_trace(vp)
+    price_traces.append(vp)
 
     # Add volume trace to 2nd row
-    cl = futil.get_volume_colors(mc_style)
-    colors = [cl['up'] if c >= o
-              else cl['down'] for o, c in zip(df['Open'], df['Close'])]
+    marker = futil.get_volume_bar_marker(opens, closes, mc_style)
     volume = go.Bar(
-        x=df.index, y=df['Volume'], name='Volume',
-        marker_color=colors, opacity=0.7,
+        x=dates, y=volumes, name='Volume',
+        marker=marker, opacity=0.7,
         #xaxis='x2', yaxis='y3',
     )
-    fig.add_trace(volume, row=2, col=1)
+    volume_traces = [volume]
 
     # Add moving average volume to 2nd row
-    df[f'vma{vma_nitems}'] = df['Volume'].rolling(window=vma_nitems).mean()
-    vma = go.Scatter(
-        x=df.index, y=df[f'vma{vma_nitems}'],
-        name=f'VMA {vma_nitems}',
-        line=dict(color='purple', width=2),
-        #xaxis='x2', yaxis='y3'
-    )
-    fig.add_trace(vma, row=2, col=1)
+    if vma_nitems <= len(df):
+        vmas = rolling_means(volumes, [vma_nitems], dtype=np.float32)
+        vma = scatter_type(
+            x=dates, y=vmas[0],
+            name=f'VMA {vma_nitems}', mode='lines',
+            line=dict(color='purple', width=2),
+            #xaxis='x2', yaxis='y3'
+        )
+        volume_traces.append(vma)
 
-    # Convert datetime index to string format suitable for display
-    if interval.endswith('m') or interval.endswith('h'):
-        df.index = df.index.strftime('%Y-%m-%d %H:%M')
+    # Add the traces in two batches: the price traces carry their own axes,
+    # while the volume traces are placed into the 2nd row
+    fig.add_traces(price_traces)
+    fig.add_traces(volume_traces, rows=2, cols=1)
+
+    # Hide non-trading periods
+    if hides_nontrading:
+        futil.hide_nontrading_periods(fig, df, interval)
+
+    # Set the same range for both price axes, so that they have the same
+    # scale and range
+    y_range = [float(np.nanmin(closes)) * 0.95,
+               float(np.nanmax(closes)) * 1.05]
+
+    if hbar_align_on_right:
+        # change the starting position of the horizontal bars to the right
+        bin_side, price_side, bin_autorange = 'right', 'left', 'reversed'
     else:
-        df.index = df.index.strftime('%Y-%m-%d')
+        bin_side, price_side, bin_autorange = 'left', 'right', None
+
+    # The figure already carries the default template; applying a template
+    # validates and copies all of it, so apply only a different one
+    if template != pio.templates.default:
+        fig.layout.template = template
 
     # Update layout
     fig.update_layout(
         legend=dict(yanchor='top', xanchor="left", x=1),
 
-        xaxis=dict(side='top', title=f'Bin Comulative {profile_field}'),
-        yaxis=dict(side='left', title='Bin Price'),
+        xaxis=dict(side='top', title=f'Bin Comulative {profile_field}',
+                   autorange=bin_autorange),
+        yaxis=dict(side=bin_side, title='Bin Price', range=y_range),
 
-        xaxis2=dict(overlaying='x', side='bottom'),     # datetime
-        yaxis2=dict(side='right', title='Price'),
+        xaxis2=dict(overlaying='x', side='bottom', type='date'),   # datetime
+        yaxis2=dict(side=price_side, title='Price', range=y_range),
         yaxis3=dict(side='right', title='Volume'),
 
         xaxis_rangeslider_visible=False,
         xaxis2_rangeslider_visible=False,
-        template=template,
     )
 
-    # Update the layout to set the same range for both y-axes
-    # This ensures that both price axes have the same scale and range
-    y_range = [min(df['Close']) * 0.95, max(df['Close']) * 1.05]
-    fig.update_layout(
-        yaxis=dict(range=y_range),
-        yaxis2=dict(range=y_range)
-    )
-
-    if hbar_align_on_right:
-        # change the starting position of the horizontal bars to the right
-        fig.update_layout(xaxis=dict(autorange='reversed'))
-        fig.update_layout(
-            yaxis=dict(side='right', title='Bin Price'),
-            yaxis2=dict(side='left', title='Price'),
-        )
-
-    if hides_nontrading:
-        futil.hide_nontrading_periods(fig, df, interval)
-
     # For Crosshair cursor
     futil.add_crosshair_cursor(fig)
     futil.add_hovermode_menu(fig)
 
+    # Downsample long histories (e.g., a long period of intraday bars)
+    if len(df) > 5000:
+        fig = futil.resample_figure(fig)
+
     return fig
 
 
@@ -160,7 +189,8 @@ class Volume:
              ma_nitems=(5, 10, 20, 50, 150), vma_nitems=50, total_bins=42,
              hbar_align_on_right=True,
              market_color_style=MarketColorStyle.AUTO,
-             template='plotly', hides_nontrading=True, out_dir='out'):
+             template='plotly', hides_nontrading=True, out_dir='out',
+             shows_figure=True):
         """Plot a price-by-volume, PBV  (also called volume profile) figure for
         a given stock. This figure shows the volume distribution across price
         levels for a stock.
@@ -237,28 +267,50 @@ class Volume:
             Whether to hide non-trading periods. Default is True.
         out_dir: str, optional
             Directory to save the output HTML file. Default is 'out'.
+        shows_figure: bool, optional
+            Whether to show the figure before writing it. Set it to False when
+            plotting many stocks in a batch. Default is True.
         """
         # Download stock data
         ticker = tw.as_yfinance(symbol)
-        df = yf.Ticker(ticker).history(period=period, interval=interval)
+        df = download_history(ticker, period, interval)
 
         # Plot
         fig = _plot(df, ticker, market_color_style, 'Volume',
-                    period, interval, ma_nitems, vma_nitems, total_bins,
+                    interval, ma_nitems, vma_nitems, total_bins,
                     hbar_align_on_right, template, hides_nontrading)
+        first, last = futil.format_date_range(df.index, interval)
         fig.update_layout(
-            title=f'{symbol} - {interval} ({df.index[0]} to {df.index[-1]})',
+            title=f'{symbol} - {interval} ({first} to {last})',
             title_x=0.5, title_y=.98
         )
 
         # Show the figure
-        fig.show()
+        if shows_figure:
+            fig.show()
 
         # Write the figure to an HTML file
         out_dir = file_utils.make_dir(out_dir)
-        fn = file_utils.gen_fn_info(symbol, interval, df.index[-1],
+        fn = file_utils.gen_fn_info(symbol, interval, last,
                                    'volume_prf')
-        fig.write_html(f'{out_dir}/{fn}.html')
+        futil.write_html(fig, out_dir, fn)
+
+    @staticmethod
+    def plot_many(symbols, max_workers=8, **kwargs):
+        """Plot the figures of several stocks concurrently.
+
+        Parameters
+        ----------
+        symbols: list of str
+            the stock symbols.
+        max_workers: int, optional
+            Maximum number of threads to use. Default is 8.
+        kwargs:
+            other arguments of Volume.plot (e.g., period, interval).
+            shows_figure defaults to False here, so that only the HTML files
+            are written.
+        """
+        _plot_many(Volume.plot, symbols, max_workers, kwargs)
 
 
 class Turnover:
@@ -271,7 +323,8 @@ class Turnover:
              ma_nitems=(5, 10, 20, 50, 150), vma_nitems=50, total_bins=42,
              hbar_align_on_right=True,
              market_color_style=MarketColorStyle.AUTO,
-             template='plotly', hides_nontrading=True, out_dir='out'):
+             template='plotly', hides_nontrading=True, out_dir='out',
+             shows_figure=True):
         """Plot a price-by-volume, PBV  (also called volume profile) figure for
         a given stock. This figure shows the volume distribution across price
         levels for a stock.
@@ -347,30 +400,51 @@ class Turnover:
             Whether to hide non-trading periods. Default is True.
         out_dir: str, optional
             Directory to save the output HTML file. Default is 'out'.
+        shows_figure: bool, optional
+            Whether to show the figure before writing it. Set it to False when
+            plotting many stocks in a batch. Default is True.
         """
         # Download stock data
         ticker = tw.as_yfinance(symbol)
-        df = yf.Ticker(ticker).history(period=period, interval=interval)
-        df['Turnover'] = df['Close'] * df['Volume']
+        df = download_history(ticker, period, interval)
 
         # Plot
         fig = _plot(df, ticker, market_color_style, 'Turnover',
-                    period, interval, ma_nitems, vma_nitems, total_bins,
+                    interval, ma_nitems, vma_nitems, total_bins,
                     hbar_align_on_right, template, hides_nontrading)
+        first, last = futil.format_date_range(df.index, interval)
         fig.update_layout(
-            title=f'{symbol} - {interval} ({df.index[0]} to {df.index[-1]})',
+            title=f'{symbol} - {interval} ({first} to {last})',
             title_x=0.5, title_y=.98,
             xaxis=dict(title='Bin Comulative Turnover (Price*Volume)'),
         )
 
         # Show the figure
-        fig.show()
+        if shows_figure:
+            fig.show()
 
         # Write the figure to an HTML file
         out_dir = file_utils.make_dir(out_dir)
-        fn = file_utils.gen_fn_info(symbol, interval, df.index[-1],
+        fn = file_utils.gen_fn_info(symbol, interval, last,
                                    'turnover_prf')
-        fig.write_html(f'{out_dir}/{fn}.html')
+        futil.write_html(fig, out_dir, fn)
+
+    @staticmethod
+    def plot_many(symbols, max_workers=8, **kwargs):
+        """Plot the figures of several stocks concurrently.
+
+        Parameters
+        ----------
+        symbols: list of str
+            the stock symbols.
+        max_workers: int, optional
+            Maximum number of threads to use. Default is 8.
+        kwargs:
+            other arguments of Turnover.plot (e.g., period, interval).
+            shows_figure defaults to False here, so that only the HTML files
+            are written.
+        """
+        _plot_many(Turnover.plot, symbols, max_workers, kwargs)
 
 
 if __name__ == '__main__':
@@ -3,28 +3,30 @@ Visualize a profile chart (eigher Volume Profile or Turnover Profile) with
 4-section layout for a given stock.
 """
 __software__ = "Volume Profile with Plotly 2x2 subplots"
-__version__ = "2.5"
+__version__ = "2.6"
 __author__ = "York <york.jong@gmail.com>"
-__date__ = "2023/02/02 (initial version) ~ 2024/08/20 (last revision)"
+__date__ = "2023/02/02 (initial version) ~ 2026/10/16 (last revision)"
 
 __all__ = [
     'Volume',   # Volume Profile, i.e., PBV (Price-by-Volume) or Volume-by-Price
     'Turnover', # Turnover Profile
 ]
 
-import yfinance as yf
+import numpy as np
 import pandas as pd
 import plotly.graph_objs as go
 from plotly.subplots import make_subplots
 
 from .. import tw
 from .. import file_utils
+from ..yf_utils import download_history
+from ..ta import rolling_means
 from . import fig_utils as futil
 from ..utils import MarketColorStyle, decide_market_color_style
 
 
 def _plot(df, ticker, market_color_style, profile_field='Volume',
-          period='1y', interval='1d',
+          interval='1d',
           ma_nitems=(5, 10, 20, 50, 150), vma_nitems=50, total_bins=42,
           template='plotly', hides_nontrading=True):
     # Initialize empty plot with marginal subplots
@@ -41,65 +43,75 @@ def _plot(df, ticker, market_color_style, profile_field='Volume',
         figure=go.Figure(layout=go.Layout(height=720))
     )
 
+    opens, highs, lows, closes = futil.get_ohlc_arrays(df)
+    volumes = df['Volume'].to_numpy()
+    dates = futil.get_plot_dates(df.index)     # wall-clock datetime64
+
     # Plot the candlestick chart
     mc_style = decide_market_color_style(ticker, market_color_style)
     mc_colors = futil.get_candlestick_colors(mc_style)
     candlestick = go.Candlestick(
-        x=df.index,
-        open=df['Open'], high=df['High'], low=df['Low'], close=df['Close'],
+        x=dates,
+        open=opens, high=highs, low=lows, close=closes,
         name='Candle',
         **mc_colors
     )
-    fig.add_trace(candlestick, row=1, col=1)
+    price_traces = [candlestick]
 
     # Add moving averages to the figure
-    colors = ('orange', 'red', 'green', 'blue', 'cyan', 'magenta', 'yellow')
-    for d, c in zip(ma_nitems, colors):
-        df[f'ma{d}'] = df['Close'].rolling(window=d).mean()
-        ma = go.Scatter(x=df.index, y=df[f'ma{d}'], name=f'MA {d}',
-                        line=dict(color=f'{c}', width=2), opacity=0.5)
-        fig.add_trace(ma, row=1, col=1)
+    scatter_type = futil.get_scatter_type(len(df), hides_nontrading)
+    mas = rolling_means(closes, ma_nitems, dtype=np.float32)
+    for d, c, sma in zip(ma_nitems, futil.MA_COLORS, mas):
+        if d > len(df):
+            continue    # no MA value at all; skip the empty trace
+        ma = scatter_type(x=dates, y=sma, name=f'MA {d}',
+                          line=dict(color=c, width=2), opacity=0.5)
+        price_traces.append(ma)
 
     # Add volume trace to 2nd row
-    cl = futil.get_volume_colors(mc_style)
-    colors = [cl['up'] if c >= o
-              else cl['down'] for o, c in zip(df['Open'], df['Close'])]
-    volume = go.Bar(x=df.index, y=df['Volume'], name='Volume',
-                    marker_color=colors)
-    fig.add_trace(volume, row=2, col=1)
+    marker = futil.get_volume_bar_marker(opens, closes, mc_style)
+    volume = go.Bar(x=dates, y=volumes, name='Volume',
+                    marker=marker)
+    volume_traces = [volume]
 
     # Add moving average volume to 2nd row
-    df[f'vma{vma_nitems}'] = df['Volume'].rolling(window=vma_nitems).mean()
-    vma = go.Scatter(x=df.index, y=df[f'vma{vma_nitems}'],
-                     name=f'VMA {vma_nitems}',
-                     line=dict(color='purple', width=2))
-    fig.add_trace(vma, row=2, col=1)
+    if vma_nitems <= len(df):
+        vmas = rolling_means(volumes, [vma_nitems], dtype=np.float32)
+        vma = scatter_type(x=dates, y=vmas[0],
+                           name=f'VMA {vma_nitems}',
+                           line=dict(color='purple', width=2))
+        volume_traces.append(vma)
 
     # Add Price by Volume (Volume Profile) chart
-    bin_size = (max(df['High']) - min(df['Low'])) / total_bins
-    bin_round = lambda x: bin_size * round(x / bin_size)
-    bin = df[profile_field].groupby(
-            df['Close'].apply(lambda x: bin_round(x))).sum()
-    fig.add_trace(
-        go.Bar(
-            y=bin.keys(),   # Price
-            x=bin.values,   # Bin Comulative Volume
-            text=bin,       # (price, volume) pairs
-            name="Price Bins",
-            orientation="h",    # 'v', 'h'
-            marker_color="brown",
-            texttemplate="%{x:3.2f}",
-            hoverinfo="y",   # 'x', 'y', 'x+y'
-            opacity=0.5
-        ),
-        row=1, col=2
+    if profile_field == 'Turnover':
+        # turnover (trading value) = price * volume
+        values = np.multiply(df['Close'].to_numpy(), volumes)
+    else:
+        values = df[profile_field].to_numpy()
+    prices, sums = futil.get_price_bins(highs, lows, closes, values,
+                                        total_bins)
+    vp = go.Bar(
+        y=prices,       # Price
+        x=sums,         # Bin Comulative Volume
+        name="Price Bins",
+        orientation="h",    # 'v', 'h'
+        marker_color="brown",
+        texttemplate="%{x:3.2f}",
+        hoverinfo="y",   # 'x', 'y', 'x+y'
+        opacity=0.5
     )
 
-    # Convert datetime index to string format suitable for display
-    if interval.endswith('m') or interval.endswith('h'):
-        df.index = df.index.strftime('%Y-%m-%d %H:%M')
-    else:
-        df.index = df.index.strftime('%Y-%m-%d')
+    # Add all traces to their subplots in one batch
+    nprice, nvolume = len(price_traces), len(volume_traces)
+    fig.add_traces(
+        price_traces + volume_traces + [vp],
+        rows=[1] * nprice + [2] * nvolume + [1],
+        cols=[1] * (nprice + nvolume) + [2],
+    )
+
+    # Hide non-trading periods
+    if hides_nontrading:
+        futil.hide_nontrading_periods(fig, df, interval)
 
     # Update layout
     fig.update_layout(
@@ -118,15 +130,13 @@ def _plot(df, ticker, market_color_style, profile_field='Volume',
     )
     # Update the layout to set the same range for both y-axes
     # This ensures that both price axes have the same scale and range
-    y_range = [min(df['Close']) * 0.95, max(df['Close']) * 1.05]
+    y_range = [float(np.nanmin(closes)) * 0.95,
+               float(np.nanmax(closes)) * 1.05]
     fig.update_layout(
         yaxis=dict(range=y_range),
         yaxis2=dict(range=y_range)
     )
 
-    if hides_nontrading:
-        futil.hide_nontrading_periods(fig, df, interval)
-
     # For Crosshair cursor
     futil.add_crosshair_cursor(fig)
     futil.add_hovermode_menu(fig)
@@ -141,7 +151,8 @@ class Volume:
     def plot(symbol='TSLA', period='1y', interval='1d',
              ma_nitems=(5, 10, 20, 50, 150), vma_nitems=50, total_bins=42,
              market_color_style=MarketColorStyle.AUTO,
-             template='plotly', hides_nontrading=True, out_dir='out'):
+             template='plotly', hides_nontrading=True, out_dir='out',
+             shows_figure=True):
         """Plot a price-by-volume, PBV  (also called volume profile) figure for
         a given stock. This figure shows the volume distribution across price
         levels for a stock.
@@ -214,28 +225,33 @@ class Volume:
             Whether to hide non-trading periods. Default is True.
         out_dir: str, optional
             Directory to save the output HTML file. Default is 'out'.
+        shows_figure: bool, optional
+            Whether to show the figure before writing it. Set it to False when
+            plotting many stocks in a batch. Default is True.
         """
         # Download stock data
         ticker = tw.as_yfinance(symbol)
-        df = yf.Ticker(ticker).history(period=period, interval=interval)
+        df = download_history(ticker, period, interval)
 
         # Plot
         fig = _plot(df, ticker, market_color_style, 'Volume',
-                    period, interval, ma_nitems, vma_nitems,
+                    interval, ma_nitems, vma_nitems,
                     total_bins, template, hides_nontrading)
+        first, last = futil.format_date_range(df.index, interval)
         fig.update_layout(
-            title=f'{symbol} - {interval} ({df.index[0]} to {df.index[-1]})',
+            title=f'{symbol} - {interval} ({first} to {last})',
             title_x=0.5, title_y=.9,
         )
 
         # Show the figure
-        fig.show()
+        if shows_figure:
+            fig.show()
 
         # Write the figure to an HTML file
         out_dir = file_utils.make_dir(out_dir)
-        fn = file_utils.gen_fn_info(symbol, interval, df.index[-1],
+        fn = file_utils.gen_fn_info(symbol, interval, last,
                                    'volume_prf')
-        fig.write_html(f'{out_dir}/{fn}.html')
+        futil.write_html(fig, out_dir, fn)
 
 
 class Turnover:
@@ -247,7 +263,8 @@ class Turnover:
     def plot(symbol='TSLA', period='1y', interval='1d',
              ma_nitems=(5, 10, 20, 50, 150), vma_nitems=50, total_bins=42,
              market_color_style=MarketColorStyle.AUTO,
-             template='plotly', hides_nontrading=True, out_dir='out'):
+             template='plotly', hides_nontrading=True, out_dir='out',
+             shows_figure=True):
         """Plot a price-by-volume, PBV  (also called volume profile) figure for
         a given stock. This figure shows the volume distribution across price
         levels for a stock.
@@ -320,29 +337,33 @@ class Turnover:
             Whether to hide non-trading periods. Default is True.
         out_dir: str, optional
             Directory to save the output HTML file. Default is 'out'.
+        shows_figure: bool, optional
+            Whether to show the figure before writing it. Set it to False when
+            plotting many stocks in a batch. Default is True.
         """
         # Download stock data
         ticker = tw.as_yfinance(symbol)
-        df = yf.Ticker(ticker).history(period=period, interval=interval)
-        df['Turnover'] = df['Close'] * df['Volume']
+        df = download_history(ticker, period, interval)
 
         # Plot
         fig = _plot(df, ticker, market_color_style, 'Turnover',
-                    period, interval, ma_nitems, vma_nitems,
+                    interval, ma_nitems, vma_nitems,
                     total_bins, template, hides_nontrading)
+        first, last = futil.format_date_range(df.index, interval)
         fig.update_layout(
-            title=f'{symbol} - {interval} ({df.index[0]} to {df.index[-1]})',
+            title=f'{symbol} - {interval} ({first} to {last})',
             title_x=0.5, title_y=.9,
         )
 
         # Show the figure
-        fig.show()
+        if shows_figure:
+            fig.show()
 
         # Write the figure to an HTML file
         out_dir = file_utils.make_dir(out_dir)
-        fn = file_utils.gen_fn_info(symbol, interval, df.index[-1],
+        fn = file_utils.gen_fn_info(symbol, interval, last,
                                    'turnover_prf')
-        fig.write_html(f'{out_dir}/{fn}.html')
+        futil.write_html(fig, out_dir, fn)
 
 
 if __name__ == '__main__':
@@ -5,18 +5,20 @@ Show a price-and-volume overlaid stock chart.
 * Plot with Plotly (for candlestick, MA, volume, volume MA)
 """
 __software__ = "Price and Volume overlaid stock chart"
-__version__ = "1.11"
+__version__ = "1.12"
 __author__ = "York <york.jong@gmail.com>"
-__date__ = "2023/02/02 (initial version) ~ 2024/08/20 (last revision)"
+__date__ = "2023/02/02 (initial version) ~ 2026/10/16 (last revision)"
 
 __all__ = ['plot']
 
-import yfinance as yf
+import numpy as np
 import pandas as pd
 import plotly.graph_objs as go
 
 from .. import tw
 from .. import file_utils
+from ..yf_utils import download_history
+from ..ta import rolling_means
 from . import fig_utils as futil
 from ..utils import MarketColorStyle, decide_market_color_style
 
@@ -24,7 +26,8 @@ from ..utils import MarketColorStyle, decide_market_color_style
 def plot(symbol='TSLA', period='1y', interval='1d',
          ma_nitems=(5, 10, 20, 50, 150), vma_nitems=50,
          market_color_style=MarketColorStyle.AUTO,
-         template='plotly', hides_nontrading=True, out_dir='out'):
+         template='plotly', hides_nontrading=True, out_dir='out',
+         shows_figure=True):
     """Plot a stock figure overlaying charts in a single subplot.
 
     These charts include candlesticks, price moving-average lines, a volume
@@ -90,51 +93,55 @@ def plot(symbol='TSLA', period='1y', interval='1d',
         Whether to hide non-trading periods. Default is True.
     out_dir: str, optional
         Directory to save the output HTML file. Default is 'out'.
+    shows_figure: bool, optional
+        Whether to show the figure before writing it. Set it to False when
+        plotting many stocks in a batch. Default is True.
     """
     # Download stock data
     ticker = tw.as_yfinance(symbol)
-    df = yf.Ticker(ticker).history(period=period, interval=interval)
+    df = download_history(ticker, period, interval)
+
+    opens, highs, lows, closes = futil.get_ohlc_arrays(df)
+    volumes = df['Volume'].to_numpy()
+    dates = futil.get_plot_dates(df.index)     # wall-clock datetime64
 
     # Add the candlestick chart
     mc_style = decide_market_color_style(ticker, market_color_style)
     mc_colors = futil.get_candlestick_colors(mc_style)
     candlestick = go.Candlestick(
-        x=df.index,
-        open=df['Open'], high=df['High'], low=df['Low'], close=df['Close'],
+        x=dates,
+        open=opens, high=highs, low=lows, close=closes,
         name='Candle',
         **mc_colors
     )
-    fig = go.Figure(data=[candlestick])
+    traces = [candlestick]
 
     # Add moving averages to the figure
-    colors = ('orange', 'red', 'green', 'blue', 'cyan', 'magenta', 'yellow')
-    for d, c in zip(ma_nitems, colors):
-        df[f'ma{d}'] = df['Close'].rolling(window=d).mean()
-        ma = go.Scatter(x=df.index, y=df[f'ma{d}'], name=f'MA {d}',
-                        line=dict(color=f'{c}', width=2))
-        fig.add_trace(ma)
+    mas = rolling_means(closes, ma_nitems, dtype=np.float32)
+    for d, c, sma in zip(ma_nitems, futil.MA_COLORS, mas):
+        ma = go.Scatter(x=dates, y=sma, name=f'MA {d}',
+                        line=dict(color=c, width=2))
+        traces.append(ma)
 
     # Create separate y-axis for volume
-    volume = go.Bar(x=df.index, y=df['Volume'], name='Volume', yaxis='y2',
+    volume = go.Bar(x=dates, y=volumes, name='Volume', yaxis='y2',
                     marker_color='orange', opacity=0.3)
-    fig.add_trace(volume)
+    traces.append(volume)
 
     # Add the volume moving average line
-    df[f'vma{vma_nitems}'] = df['Volume'].rolling(window=vma_nitems).mean()
-    vma = go.Scatter(x=df.index, y=df[f'vma{vma_nitems}'],
+    vmas = rolling_means(volumes, [vma_nitems], dtype=np.float32)
+    vma = go.Scatter(x=dates, y=vmas[0],
                      name=f'VMA {vma_nitems}', yaxis='y2',
                      line=dict(color='purple'))
-    fig.add_trace(vma)
+    traces.append(vma)
 
-    # Convert datetime index to string format suitable for display
-    if interval.endswith('m') or interval.endswith('h'):
-        df.index = df.index.strftime('%Y-%m-%d %H:%M')
-    else:
-        df.index = df.index.strftime('%Y-%m-%d')
+    # Create the figure with all traces at once
+    fig = go.Figure(data=traces)
 
     # Update layout
+    first, last = futil.format_date_range(df.index, interval)
     fig.update_layout(
-        title=f'{symbol} - {interval} ({df.index[0]} to {df.index[-1]})',
+        title=f'{symbol} - {interval} ({first} to {last})',
         title_x=0.5, title_y=.9,
         legend=dict(yanchor='top', xanchor="left", x=1.042),
 
@@ -153,12 +160,13 @@ def plot(symbol='TSLA', period='1y', interval='1d',
     futil.add_hovermode_menu(fig)
 
     # Show the figure
-    fig.show()
+    if shows_figure:
+        fig.show()
 
     # Write the figure to an HTML file
     out_dir = file_utils.make_dir(out_dir)
-    fn = file_utils.gen_fn_info(symbol, interval, df.index[-1], __file__)
-    fig.write_html(f'{out_dir}/{fn}.html')
+    fn = file_utils.gen_fn_info(symbol, interval, last, __file__)
+    futil.write_html(fig, out_dir, fn)
 
 
 if __name__ == '__main__':
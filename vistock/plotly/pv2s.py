@@ -5,19 +5,23 @@ Show a price-and-volume separated stock chart.
 * Plot with Plotly (for candlestick, MA, volume, volume MA)
 """
 __software__ = "Price and Volume separated stock chart"
-__version__ = "1.11"
+__version__ = "1.13"
 __author__ = "York <york.jong@gmail.com>"
-__date__ = "2023/02/02 (initial version) ~ 2024/08/20 (last revision)"
+__date__ = "2023/02/02 (initial version) ~ 2026/10/16 (last revision)"
 
-__all__ = ['plot']
+__all__ = ['plot', 'plot_many']
 
-import yfinance as yf
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
 import plotly.graph_objs as go
 from plotly.subplots import make_subplots
 
 from .. import tw
 from .. import file_utils
+from ..yf_utils import download_history
+from ..ta import rolling_means
 from . import fig_utils as futil
 from ..utils import MarketColorStyle, decide_market_color_style
 
@@ -25,7 +29,8 @@ from ..utils import MarketColorStyle, decide_market_color_style
 def plot(symbol='TSLA', period='1y', interval='1d',
          ma_nitems=(5, 10, 20, 50, 150), vma_nitems=50,
          market_color_style=MarketColorStyle.AUTO,
-         template='plotly', hides_nontrading=True, out_dir='out'):
+         template='plotly', hides_nontrading=True, out_dir='out',
+         shows_figure=True):
     """Plot a stock figure that consists of two subplots: a price subplot and
     a volume subplot.
 
@@ -93,10 +98,13 @@ def plot(symbol='TSLA', period='1y', interval='1d',
         Whether to hide non-trading periods. Default is True.
     out_dir: str, optional
         Directory to save the output HTML file. Default is 'out'.
+    shows_figure: bool, optional
+        Whether to show the figure before writing it. Set it to False when
+        plotting many stocks in a batch. Default is True.
     """
     # Download stock data
     ticker = tw.as_yfinance(symbol)
-    df = yf.Ticker(ticker).history(period=period, interval=interval)
+    df = download_history(ticker, period, interval)
 
     # Initialize empty plot with a marginal subplot
     fig = make_subplots(
@@ -108,49 +116,45 @@ def plot(symbol='TSLA', period='1y', interval='1d',
     )
     #print(fig)
 
+    opens, highs, lows, closes = futil.get_ohlc_arrays(df)
+    volumes = df['Volume'].to_numpy()
+    dates = futil.get_plot_dates(df.index)     # wall-clock datetime64
+
     # Plot the candlestick chart
     mc_style = decide_market_color_style(ticker, market_color_style)
     mc_colors = futil.get_candlestick_colors(mc_style)
     candlestick = go.Candlestick(
-        x=df.index,
-        open=df['Open'], high=df['High'], low=df['Low'], close=df['Close'],
+        x=dates,
+        open=opens, high=highs, low=lows, close=closes,
         name='Candle',
         **mc_colors
     )
     fig.add_trace(candlestick)
 
     # Add moving averages to the figure
-    colors = ('orange', 'red', 'green', 'blue', 'cyan', 'magenta', 'yellow')
-    for d, c in zip(ma_nitems, colors):
-        df[f'ma{d}'] = df['Close'].rolling(window=d).mean()
-        ma = go.Scatter(x=df.index, y=df[f'ma{d}'], name=f'MA {d}',
-                        line=dict(color=f'{c}', width=2), opacity=0.4)
+    mas = rolling_means(closes, ma_nitems, dtype=np.float32)
+    for d, c, sma in zip(ma_nitems, futil.MA_COLORS, mas):
+        ma = go.Scatter(x=dates, y=sma, name=f'MA {d}',
+                        line=dict(color=c, width=2), opacity=0.4)
         fig.add_trace(ma)
 
     # Add volume trace to 2nd row
-    cl = futil.get_volume_colors(mc_style)
-    colors = [cl['up'] if c >= o
-              else cl['down'] for o, c in zip(df['Open'], df['Close'])]
-    volume = go.Bar(x=df.index, y=df['Volume'], name='Volume',
-                    marker_color=colors, opacity=0.5)
+    marker = futil.get_volume_bar_marker(opens, closes, mc_style)
+    volume = go.Bar(x=dates, y=volumes, name='Volume',
+                    marker=marker, opacity=0.5)
     fig.add_trace(volume, row=2, col=1)
 
     # Add moving average volume to 2nd row
-    df[f'vma{vma_nitems}'] = df['Volume'].rolling(window=vma_nitems).mean()
-    vma50 = go.Scatter(x=df.index, y=df[f'vma{vma_nitems}'],
+    vmas = rolling_means(volumes, [vma_nitems], dtype=np.float32)
+    vma50 = go.Scatter(x=dates, y=vmas[0],
                        name=f'VMA {vma_nitems}',
                        line=dict(color='purple', width=2))
     fig.add_trace(vma50, row=2, col=1)
 
-    # Convert datetime index to string format suitable for display
-    if interval.endswith('m') or interval.endswith('h'):
-        df.index = df.index.strftime('%Y-%m-%d %H:%M')
-    else:
-        df.index = df.index.strftime('%Y-%m-%d')
-
     # Update layout
+    first, last = futil.format_date_range(df.index, interval)
     fig.update_layout(
-        title=f'{symbol} - {interval} ({df.index[0]} to {df.index[-1]})',
+        title=f'{symbol} - {interval} ({first} to {last})',
         title_x=0.5, title_y=.9,
         legend=dict(yanchor='top', xanchor="left", x=1.042),
 
@@ -168,13 +172,41 @@ def plot(symbol='TSLA', period='1y', interval='1d',
     futil.add_crosshair_cursor(fig)
     futil.add_hovermode_menu(fig)
 
+    # Downsample long histories (e.g., a long period of intraday bars)
+    if len(df) > 5000:
+        fig = futil.resample_figure(fig)
+
     # Show the figure
-    fig.show()
+    if shows_figure:
+        fig.show()
 
     # Write the figure to an HTML file
     out_dir = file_utils.make_dir(out_dir)
-    fn = file_utils.gen_fn_info(symbol, interval, df.index[-1], __file__)
-    fig.write_html(f'{out_dir}/{fn}.html')
+    fn = file_utils.gen_fn_info(symbol, interval, last, __file__)
+    futil.write_html(fig, out_dir, fn)
+
+
+def plot_many(symbols, max_workers=8, **kwargs):
+    """Plot the figures of several stocks concurrently.
+
+    Each symbol is plotted by plot() in a thread pool, so that the downloads
+    and HTML writes of different symbols overlap.
+
+    Parameters
+    ----------
+    symbols: list of str
+        the stock symbols.
+    max_workers: int, optional
+        Maximum number of threads to use. Default is 8.
+    kwargs:
+        other arguments of plot (e.g., period, interval). shows_figure
+        defaults to False here, so that only the HTML files are written
+        instead of a browser tab being opened per symbol.
+    """
+    kwargs.setdefault('shows_figure', False)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Consume the results to re-raise any exception of a plot call
+        list(executor.map(lambda symbol: plot(symbol, **kwargs), symbols))
 
 
 if __name__ == '__main__':
@@ -2,13 +2,14 @@
 Utilities for Ranking tables
 """
 __author__ = "York <york.jong@gmail.com>"
-__date__ = "2024/10/06 (initial version) ~ 2024/10/10 (last revision)"
+__date__ = "2024/10/06 (initial version) ~ 2026/10/16 (last revision)"
 
 __all__ = [
     'append_ratings',
     'groupby_industry',
     'move_columns_to_end',
 ]
+import numpy as np
 import pandas as pd
 
 
@@ -50,6 +51,13 @@ def append_ratings(stock_df, columns, rating_columns=None, method='rank'):
     if len(columns) != len(rating_columns):
         raise ValueError("The length of columns and rating_columns must match.")
 
+    if method == 'rank':
+        # Rank all the columns with one DataFrame.rank call
+        ratings = _rank_ratings(stock_df[columns].rank(pct=True).to_numpy())
+        for rating_col_name, r in zip(rating_columns, ratings.T):
+            stock_df[rating_col_name] = _int_ratings(r)
+        return stock_df
+
     for col, rating_col_name in zip(columns, rating_columns):
         stock_df[rating_col_name] = calc_ratings(stock_df[col], method)
 
@@ -80,14 +88,36 @@ def calc_ratings(series, method='rank'):
     ------
     ValueError
         If the method is not 'rank' or 'qcut'.
+
+    Examples
+    --------
+    >>> series = pd.Series([3, 1, 4, 1, 5, np.nan, 9, 2, 6, 5, 3, 5] * 20)
+    >>> qcut = pd.qcut(series, 99, labels=False, duplicates='drop') + 1
+    >>> calc_ratings(series, 'qcut').equals(qcut.astype('Int64'))
+    True
+    >>> calc_ratings(pd.Series([0.5, np.nan, 0.1, 0.5]), 'rank').tolist()
+    [83, <NA>, 34, 83]
     """
     if method == 'rank':
-        ratings = series.rank(pct=True).mul(98) + 1
+        ratings = _rank_ratings(series.rank(pct=True).to_numpy())
     elif method == 'qcut':
-        ratings = pd.qcut(series, 99, labels=False, duplicates='drop') + 1
+        # labels=False gives the bin codes only (no Categorical of intervals)
+        ratings = pd.qcut(series, 99, labels=False,
+                          duplicates='drop').to_numpy(dtype=np.float64) + 1
     else:
         raise ValueError("method must be either 'rank' or 'qcut'")
-    return ratings.round().astype('Int64')  # Use Int64 to allow NaN
+    return pd.Series(_int_ratings(ratings), index=series.index,
+                     name=series.name)
+
+
+def _rank_ratings(pct_ranks):
+    """Map percentile ranks in (0, 1] to ratings from 1 to 99."""
+    return pct_ranks * 98 + 1
+
+
+def _int_ratings(ratings):
+    """Round ratings into a nullable Int64 array (NaN becomes <NA>)."""
+    return pd.array(np.round(ratings), dtype='Int64')
 
 
 #------------------------------------------------------------------------------
@@ -114,32 +144,56 @@ def groupby_industry(stock_df, columns, key='RS'):
     -------
     pd.DataFrame
         Aggregated DataFrame grouped by industry.
+
+    Examples
+    --------
+    Numeric columns are averaged by the groupby mean and rounded to two
+    decimals afterwards, so a mean on a half-cent boundary rounds as the
+    groupby sum leaves it (40.505 is summed to just below it here):
+
+    >>> stock_df = pd.DataFrame({
+    ...     'Ticker': ['A', 'B', 'C', 'D'],
+    ...     'Industry': ['Tech'] * 4,
+    ...     'RS': [41.54, 82.98, 1.0, 36.5],
+    ... })
+    >>> groupby_industry(stock_df, ['Ticker', 'RS'])
+      Industry   Ticker    RS
+    0     Tech  B,A,D,C  40.5
     """
+    key_maps = {}   # {column: {item: key value}}, built once per column
+
     def get_sorted_items(items, column):
         """Sorts items (e.g., Tickers or Names) based on RS values."""
+        if column not in key_maps:
+            # the first row of an item decides its key value
+            firsts = stock_df.drop_duplicates(column)
+            key_maps[column] = dict(zip(firsts[column], firsts[key]))
+        key_map = key_maps[column]
         return ','.join(
             sorted(
                 map(str, items),  # Convert items to strings before joining
-                key=lambda t: stock_df.loc[stock_df[column] == t, key].values[0]
-                    if len(stock_df.loc[stock_df[column] == t, key].values) > 0
-                    else float('-inf'),  # Set default value if no matching RS
+                key=lambda t: key_map.get(t, float('-inf')),  # no matching RS
                 reverse=True
             )
         )
 
     agg_funcs = {}
+    numeric_columns = []
 
     # Process only the specified columns in `columns`
     for col in columns:
         if col in ['Ticker', 'Name']:
             agg_funcs[col] = lambda i, c=col: get_sorted_items(i, c)
         elif pd.api.types.is_numeric_dtype(stock_df[col]):
-            agg_funcs[col] = lambda x: round(x.mean(), 2)
+            agg_funcs[col] = 'mean'     # rounded below, all groups at once
+            numeric_columns.append(col)
         else:
             agg_funcs[col] = 'first'
 
     # Perform aggregation
-    industry_df = stock_df.groupby('Industry').agg(agg_funcs).reset_index()
+    industry_df = stock_df.groupby('Industry').agg(agg_funcs)
+    industry_df[numeric_columns] = industry_df[numeric_columns].round(2)
+    industry_df = industry_df.reset_index()
 
     return industry_df
 
@@ -171,3 +225,7 @@ def move_columns_to_end(df, columns_to_move):
 
 #------------------------------------------------------------------------------
 
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -33,9 +33,9 @@ See Also:
   how-to-create-the-mansfield-relative-performance-indicator>`_
 
 """
-__version__ = "5.3"
+__version__ = "5.4"
 __author__ = "York <york.jong@gmail.com>"
-__date__ = "2024/08/23 (initial version) ~ 2024/10/13 (last revision)"
+__date__ = "2024/08/23 (initial version) ~ 2026/10/16 (last revision)"
 
 __all__ = [
     'mansfield_relative_strength',
@@ -45,7 +45,6 @@ __all__ = [
 
 import numpy as np
 import pandas as pd
-import yfinance as yf
 
 from .ta import simple_moving_average, exponential_moving_average
 from . import yf_utils as yfu
@@ -64,8 +63,9 @@ def mansfield_relative_strength(closes, closes_index, window, ma='SMA'):
 
     Parameters
     ----------
-    closes: pandas.Series
-        Series of closing prices for the stock.
+    closes: pandas.Series or pandas.DataFrame
+        Series of closing prices for the stock, or a DataFrame with a column
+        of closing prices per stock to calculate all of them at once.
     closes_index: pandas.Series
         Series of closing prices for the benchmark index.
     window: int
@@ -76,9 +76,9 @@ def mansfield_relative_strength(closes, closes_index, window, ma='SMA'):
 
     Returns
     -------
-    pandas.Series
-        Series containing the calculated Mansfield Relative Strength (RSM)
-        values with given moving average method.
+    pandas.Series or pandas.DataFrame
+        Mansfield Relative Strength (RSM) values with given moving average
+        method, in the same shape as `closes`.
 
     Examples
     --------
@@ -107,13 +107,17 @@ def mansfield_relative_strength(closes, closes_index, window, ma='SMA'):
     except KeyError:
         raise ValueError("Invalid ma type. Must be 'SMA' or 'EMA'.")
 
-    closes = closes.ffill()
-    closes_index = closes_index.ffill()
-    rsd = dorsey_relative_strength(closes, closes_index)
-    rsm = ((rsd / ma_func(rsd, window)) - 1) * 100
+    rsm = _mansfield_relative_strength(closes.ffill(), closes_index.ffill(),
+                                       window, ma_func)
     return rsm.round(2)
 
 
+def _mansfield_relative_strength(closes, closes_index, window, ma_func):
+    """mansfield_relative_strength for forward-filled closes, unrounded."""
+    rsd = dorsey_relative_strength(closes, closes_index)
+    return ((rsd / ma_func(rsd, window)) - 1) * 100
+
+
 def dorsey_relative_strength(closes, closes_index):
     """
     Calculate Dorsey Relative Strength (RSD) for given close prices and index
@@ -121,18 +125,21 @@ def dorsey_relative_strength(closes, closes_index):
 
     Parameters
     ----------
-    closes: pandas.Series
-        Series of closing prices for the stock.
+    closes: pandas.Series or pandas.DataFrame
+        Series of closing prices for the stock, or a DataFrame with a column
+        of closing prices per stock.
 
     closes_index: pandas.Series
         Series of closing prices for the benchmark index.
 
     Returns
     -------
-    pandas.Series
-        Series containing the calculated Dorsey Relative Strength (RSD) values.
+    pandas.Series or pandas.DataFrame
+        Dorsey Relative Strength (RSD) values, in the same shape as `closes`.
     """
-    return (closes / closes_index) * 100
+    # Divide along the index, so each column of a DataFrame is divided by
+    # the benchmark
+    return closes.div(closes_index, axis=0) * 100
 
 #------------------------------------------------------------------------------
 # EPS Relative Strength
@@ -318,52 +325,79 @@ def build_stock_rs_df(tickers, ticker_ref='^GSPC',
         raise ValueError("Invalid interval. " "Must be '1d', or '1wk'.")
 
     # Fetch data for stocks and index
-    df_all = yf.download([ticker_ref] + tickers,
-                         period=period, interval=interval, auto_adjust=True)
-    df_ref = df_all.xs(ticker_ref, level='Ticker', axis=1)
+    df_all = yfu.download_histories([ticker_ref] + tickers,
+                                    period=period, interval=interval)
+    # Take the Close and Volume blocks once (columns are tickers), instead
+    # of slicing the MultiIndex columns of df_all for every ticker
+    closes = df_all.xs('Close', level='Price', axis=1)
+    volumes = df_all.xs('Volume', level='Price', axis=1)
     print("Num of downloaded stocks: "
           f"{len(df_all.columns.get_level_values('Ticker').unique())}")
 
-    rows = []
-    price_ma = {}
-    for ticker in tickers:
-        df = df_all.xs(ticker, level='Ticker', axis=1)
-        rsm = mansfield_relative_strength(df['Close'], df_ref['Close'],
-                                          rs_win, ma=ma)
-        for win in ma_wins:
-            price_ma[f'{win}'] = ma_func(df['Close'], win).round(2)
-        vol_div_vma = (df['Volume'] / ma_func(df['Volume'], vma_win)).round(2)
-
-        end_date = rsm.index[-1]
-
-        # Calculate position in 52W range
-        high_52w = df['Close'].rolling(window=252, min_periods=1).max().iloc[-1]
-        low_52w = df['Close'].rolling(window=252, min_periods=1).min().iloc[-1]
-        current_price = df['Close'].asof(end_date)
-        range_position = (current_price - low_52w) / (high_52w - low_52w)
-
-        # Construct DataFrame for current stock
-        row = {
-            'Ticker': ticker,
-            'RS': rsm.asof(end_date),
-            '1 Week Ago': rsm.asof(end_date - pd.DateOffset(weeks=1)),
-            '1 Month Ago': rsm.asof(end_date - pd.DateOffset(months=1)),
-            '3 Months Ago': rsm.asof(end_date - pd.DateOffset(months=3)),
-            '6 Months Ago': rsm.asof(end_date - pd.DateOffset(months=6)),
-            '9 Months Ago': rsm.asof(end_date - pd.DateOffset(months=9)),
-            'Price': df['Close'].asof(end_date).round(2),
-            '52W pos': range_position.round(2),
-            **{f'MA{w}': price_ma[f'{w}'].iloc[-1] for w in ma_wins},
-            f'Volume / VMA{vma_win}': vol_div_vma.iloc[-1],
-        }
-        rows.append(row)
-
-    # Combine rows into a single DataFrame
-    stock_df = pd.DataFrame(rows)
+    # RSM of all stocks at once: one division by the broadcast benchmark and
+    # one rolling (or ewm) pass over the whole block. The closes are
+    # forward-filled once here, the benchmark included.
+    closes_ff = closes.ffill()
+    rsms = _mansfield_relative_strength(closes_ff, closes_ff[ticker_ref],
+                                        rs_win, ma_func)
+
+    # Latest price MAs and Volume / VMA of all stocks, one MA call per
+    # window over the whole block
+    def last_ma(df, window):
+        if ma == 'SMA':
+            # only the last window is needed (min_periods=1 skips NaNs)
+            return df.iloc[-window:].mean()
+        return ma_func(df, window).iloc[-1]
+
+    price_mas = {w: last_ma(closes, w).round(2) for w in ma_wins}
+    vol_div_vmas = (volumes.iloc[-1] / last_ma(volumes, vma_win)).round(2)
+
+    # RSMs at the end date and earlier dates, one lookup for all stocks;
+    # only these values are rounded
+    end_date = rsms.index[-1]
+    rs_values = _asof(rsms[tickers], [
+        end_date,
+        end_date - pd.DateOffset(weeks=1),
+        end_date - pd.DateOffset(months=1),
+        end_date - pd.DateOffset(months=3),
+        end_date - pd.DateOffset(months=6),
+        end_date - pd.DateOffset(months=9),
+    ]).round(2)
+
+    # Calculate positions in 52W range
+    prices = closes_ff.iloc[-1]
+    high_52w = closes.iloc[-252:].max()
+    low_52w = closes.iloc[-252:].min()
+    range_positions = (prices - low_52w) / (high_52w - low_52w)
+
+    # Build the DataFrame from typed columns, instead of inferring the dtypes
+    # from a list of row dicts
+    stock_df = pd.DataFrame({
+        'Ticker': tickers,
+        **dict(zip(['RS', '1 Week Ago', '1 Month Ago', '3 Months Ago',
+                    '6 Months Ago', '9 Months Ago'], rs_values)),
+        'Price': prices[tickers].round(2).to_numpy(),
+        '52W pos': range_positions[tickers].round(2).to_numpy(),
+        **{f'MA{w}': price_mas[w][tickers].to_numpy() for w in ma_wins},
+        f'Volume / VMA{vma_win}': vol_div_vmas[tickers].to_numpy(),
+    })
 
     return stock_df
 
 
+def _asof(df, dates):
+    """
+    Look up the last valid value of every column at or before each of the
+    given dates, like df[column].asof(date), with one searchsorted.
+
+    Returns a 2-D array with a row per date and a column per column of df.
+    """
+    idxs = df.index.searchsorted(dates, side='right') - 1
+    values = df.ffill().to_numpy()[idxs]
+    values[idxs < 0] = np.nan   # dates before the first one
+    return values
+
+
 #------------------------------------------------------------------------------
 # Unit Test
 #------------------------------------------------------------------------------
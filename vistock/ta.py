@@ -1,16 +1,25 @@
 """
 Technical Analysis
 """
-__version__ = "1.3"
+__version__ = "1.6"
 __author__ = "York <york.jong@gmail.com>"
-__date__ = "2024/07/31 (initial version) ~ 2024/08/31 (last revision)"
+__date__ = "2024/07/31 (initial version) ~ 2026/10/16 (last revision)"
 
 __all__ = [
     'simple_moving_average',
     'exponential_moving_average',
+    'rolling_means',
+    'volume_profile',
     'rsi',
 ]
 
+import numpy as np
+
+try:
+    from bottleneck import move_mean   # optional; a C moving-window mean
+except ImportError:
+    move_mean = None
+
 
 def simple_moving_average(values, window, min_periods=1):
     """
@@ -83,6 +92,157 @@ def exponential_moving_average(values, window, min_periods=1, adjust=False):
                       adjust=adjust).mean()
 
 
+def rolling_means(values, windows, dtype=np.float64, min_periods=None):
+    """
+    Calculate Simple Moving Averages (SMA) of several window sizes at once.
+
+    A single cumulative sum of the values is shared by all window sizes, so
+    each moving average costs only one subtraction of two slices instead of
+    a separate rolling pass over the values.
+
+    Like ``values.rolling(window=w).mean()``, a window that contains a NaN
+    (or is not yet full) yields NaN.
+
+    If bottleneck is installed, its move_mean is used instead; it computes
+    each window in one compiled pass, which is faster and keeps the sums
+    exact over long series.
+
+    Parameters
+    ----------
+    values: array-like
+        Values for which to calculate the SMAs, e.g., a pandas.Series of
+        closing prices.
+
+    windows: sequence of int
+        Number of periods of each SMA.
+
+    dtype: data-type, optional
+        Data type of the returned SMAs (e.g., np.float32 for plotting). The
+        sums are always accumulated in float64. Default is np.float64.
+
+    min_periods: int, optional
+        Minimum number of valid values a window needs to yield a mean, like
+        ``values.rolling(window=w, min_periods=min_periods).mean()``. Such a
+        window (e.g., a window not yet full) averages its valid values only.
+        Default is None, i.e., the window size.
+
+    Returns
+    -------
+    numpy.ndarray
+        A 2-D array of shape (len(windows), len(values)); row k holds the SMA
+        of window size windows[k].
+
+    Examples
+    --------
+    >>> rolling_means([100, 105, 110, 115, 120], windows=(2, 3))
+    array([[  nan, 102.5, 107.5, 112.5, 117.5],
+           [  nan,   nan, 105. , 110. , 115. ]])
+    >>> rolling_means([1, 2, float('nan'), 4, 5, 6], windows=(2,))
+    array([[nan, 1.5, nan, nan, 4.5, 5.5]])
+    >>> rolling_means([1, 2, float('nan'), 4, 5], windows=(3,), min_periods=1)
+    array([[1. , 1.5, 1.5, 3. , 4.5]])
+    >>> rolling_means([1, 2, 3], windows=(2,), dtype=np.float32).dtype
+    dtype('float32')
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if move_mean is not None:
+        return _move_means(values, windows, dtype, min_periods)
+    n = len(values)
+    valid = ~np.isnan(values)
+    has_nan = not valid.all()
+    if has_nan:
+        values = np.where(valid, values, 0.)
+    if has_nan or min_periods is not None:
+        ccnt = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(valid, out=ccnt[1:])
+    csum = np.zeros(n + 1)
+    np.cumsum(values, out=csum[1:])
+
+    means = np.full((len(windows), n), np.nan, dtype=dtype)
+    buf = np.empty(n)   # window sums, reused by every window size
+    for k, w in enumerate(windows):
+        if min_periods is not None and 0 < w and min_periods < w:
+            # windows are clipped at the start and may hold NaNs, so each
+            # one is divided by its own count of valid values
+            starts = np.maximum(np.arange(1 - w, n - w + 1), 0)
+            counts = ccnt[1:] - ccnt[starts]
+            sums = np.subtract(csum[1:], csum[starts], out=buf)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                sums /= counts
+            sums[counts < max(min_periods, 1)] = np.nan
+            means[k] = sums
+            continue
+        if not 0 < w <= n:
+            continue
+        sums = np.subtract(csum[w:], csum[:-w], out=buf[:n-w+1])
+        sums /= w
+        if has_nan:
+            # a window holding a NaN has fewer than w valid values
+            sums[(ccnt[w:] - ccnt[:-w]) != w] = np.nan
+        means[k, w-1:] = sums
+    return means
+
+
+def _move_means(values, windows, dtype, min_periods):
+    """rolling_means computed with bottleneck.move_mean."""
+    n = len(values)
+    means = np.full((len(windows), n), np.nan, dtype=dtype)
+    for k, w in enumerate(windows):
+        min_count = w if min_periods is None else max(min_periods, 1)
+        if not 0 < min_count <= min(w, n):
+            continue
+        # a window longer than the values is clipped at the start anyway
+        means[k] = move_mean(values, min(w, n), min_count=min_count)
+    return means
+
+
+def volume_profile(prices, volumes, bin_size):
+    """
+    Calculate a Volume Profile (a.k.a. Volume-by-Price).
+
+    Each price is rounded to the nearest multiple of bin_size, and the volumes
+    of the prices in the same bin are summed up with one np.bincount call.
+
+    Parameters
+    ----------
+    prices: array-like
+        Prices (typically closing prices) that decide the bins.
+
+    volumes: array-like
+        Values to accumulate per bin, e.g., volumes or turnovers.
+
+    bin_size: float
+        Price range of a bin.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        (bin prices in ascending order, bin cumulative volumes). Only bins
+        holding at least one price are included; NaN prices are ignored.
+
+    Examples
+    --------
+    >>> volume_profile([10.1, 10.4, 11.2, 9.8], [100, 200, 300, 400], 1)
+    (array([10., 11.]), array([700., 300.]))
+    """
+    prices = np.asarray(prices)
+    if prices.dtype.kind != 'f':
+        prices = prices.astype(np.float64)  # float32 prices are kept as is
+    volumes = np.asarray(volumes, dtype=np.float64)
+
+    valid = ~np.isnan(prices)
+    idxs = np.rint(prices[valid] / bin_size).astype(np.int64)
+    if idxs.size == 0:
+        return np.array([]), np.array([])
+    base = idxs.min()
+    idxs -= base
+
+    counts = np.bincount(idxs)
+    sums = np.bincount(idxs, weights=np.nan_to_num(volumes[valid]))
+    bins = np.flatnonzero(counts)
+    return (base + bins) * float(bin_size), sums[bins]
+
+
 def rsi(data, periods=14):
     """
     Calculate the Relative Strength Index (RSI) for a given dataset.
@@ -34,9 +34,9 @@ Usage Examples:
     # Get a list of tickers for a specified market
     tickers = tw.get_tickers('TWSE')
 """
-__version__ = "2.1"
+__version__ = "2.2"
 __author__ = "York <york.jong@gmail.com>"
-__date__ = "2023/02/19 (initial version) ~ 2024/09/14 (last revision)"
+__date__ = "2023/02/19 (initial version) ~ 2026/10/16 (last revision)"
 
 __all__ = [
     'is_taiwan_stock',
@@ -202,6 +202,7 @@ class OpenAPI:
     @classmethod
     def clear_cache(cls):
         cls._lookup_cache.clear()
+        as_yfinance.cache_clear()   # its results come from the tables above
 
     @classmethod
     def value_from_key(cls, key, url, key_field, value_field):
@@ -521,6 +522,7 @@ def stock_price(code):
     return OpenAPI.stock_price(code)
 
 
+@functools.lru_cache(maxsize=4096)
 def as_yfinance(symbol):
     """
     Convert a given stock symbol into yfinance compatible stock symbol.
@@ -4,12 +4,14 @@ Utility functions for working with Yahoo Finance data.
 This module contains various utility functions for retrieving and processing
 stock data using the Yahoo Finance API via the `yfinance` library.
 """
-__version__ = "4.4"
+__version__ = "4.6"
 __author__ = "York <york.jong@gmail.com>"
-__date__ = "2024/08/26 (initial version) ~ 2025/7/10 (last revision)"
+__date__ = "2024/08/26 (initial version) ~ 2026/10/16 (last revision)"
 
 __all__ = [
     'calc_weighted_metric',
+    'download_history',
+    'download_histories',
     'fetch_financials',
     'download_financials',
     'download_tickers_info',
@@ -19,6 +21,7 @@ __all__ = [
 import sys
 import time
 import random
+import functools
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
 
@@ -170,6 +173,91 @@ def calc_weighted_metric(financials, tickers_info, metric, weight_field,
 # Stock Data Downloading
 #------------------------------------------------------------------------------
 
+def download_history(ticker, period='1y', interval='1d', ttl=900):
+    """
+    Download the OHLCV history of a stock, with the result cached per
+    (ticker, period, interval).
+
+    Plotting the same stock again (e.g., its Volume Profile and then its
+    Turnover Profile) reuses the cached data instead of another round trip to
+    Yahoo Finance. A cached result expires within ttl seconds, so intraday
+    bars keep coming in.
+
+    Parameters
+    ----------
+    ticker: str
+        Ticker symbol in yfinance format (e.g., 'TSLA', '2330.TW').
+    period: str, optional
+        The period of the data to download (e.g., '1y', 'max').
+        Defaults to '1y'.
+    interval: str, optional
+        The interval of an OHLC item (e.g., '5m', '1d'). Defaults to '1d'.
+    ttl: int, optional
+        Time to live of a cached result in seconds. Defaults to 900.
+
+    Returns
+    -------
+    DataFrame
+        The Open, High, Low, Close, and Volume columns of the history
+        returned by yfinance.Ticker.history; other columns (e.g., Dividends,
+        Stock Splits) are dropped. It is a copy of the cached result, so
+        callers may modify it freely.
+
+    Examples
+    --------
+    >>> df = download_history('TSLA', period='1mo')
+    >>> df.equals(download_history('TSLA', period='1mo'))
+    True
+    """
+    # Copying is cheap next to a download, and keeps the cache intact
+    return _cached_history(ticker, period, interval,
+                           int(time.time() // ttl)).copy()
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_history(ticker, period, interval, ttl_bucket):
+    df = yf.Ticker(ticker).history(period=period, interval=interval)
+    return df.filter(items=['Open', 'High', 'Low', 'Close', 'Volume'])
+
+
+def download_histories(tickers, period='2y', interval='1d', ttl=900):
+    """
+    Download the adjusted histories of several stocks in one batch, with the
+    result cached per (tickers, period, interval).
+
+    Ranking the same stocks again (e.g., with another moving average type)
+    reuses the cached data instead of downloading all of them again. A
+    cached result expires within ttl seconds.
+
+    Parameters
+    ----------
+    tickers: list of str
+        Ticker symbols in yfinance format (e.g., ['^GSPC', 'AAPL']).
+    period: str, optional
+        The period of the data to download (e.g., '2y', 'max').
+        Defaults to '2y'.
+    interval: str, optional
+        The interval of an OHLC item (e.g., '1d', '1wk'). Defaults to '1d'.
+    ttl: int, optional
+        Time to live of a cached result in seconds. Defaults to 900.
+
+    Returns
+    -------
+    DataFrame
+        The DataFrame returned by yfinance.download with auto_adjust=True,
+        whose columns are indexed by ('Price', 'Ticker'). It is a copy of the
+        cached result, so callers may modify it freely.
+    """
+    return _cached_histories(tuple(tickers), period, interval,
+                             int(time.time() // ttl)).copy()
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_histories(tickers, period, interval, ttl_bucket):
+    return yf.download(list(tickers), period=period, interval=interval,
+                       auto_adjust=True)
+
+
 def fetch_financials(symbol, fields=None, frequency='quarterly'):
     """
     Fetch the financials for a single ticker symbol using yfinance.